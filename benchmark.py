@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+import pandas as pd
+import plotly
+
+import data
+import fixtures
+from charts import apply_tf, line_figure
+from views import auto_dashboard, breadth, india_macro, mtf, nifty_returns, rbi_liquidity
+
+# =================================================
+# HEADLESS BENCHMARKS — each pipeline stage per view on synthetic sheets
+# =================================================
+# No browser, no Streamlit server and no Google credentials: the view modules'
+# parse / figure / HTML functions are called directly on fixtures tabs.
+SCALES = (1, 10, 100)
+TIMEFRAMES = ("W", "ME")
+
+
+def timed(fn, repeat):
+    """(min, median) wall time of fn() in milliseconds over repeat runs."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return min(samples), statistics.median(samples)
+
+
+def chart_stages(view, df, value_col):
+    """apply_tf per timeframe, figure build and figure serialisation for one series."""
+    fig = line_figure(df, "Date", value_col)
+    cases = [(view, f"apply_tf:{tf}", len(df), lambda tf=tf: apply_tf(df, "Date", tf)) for tf in TIMEFRAMES]
+    cases.append((view, "figure", len(df), lambda: line_figure(df, "Date", value_col)))
+    cases.append((view, "figure_json", len(df), fig.to_json))
+    return cases
+
+
+def cases(frames, sheet):
+    """(view, stage, rows, fn) for every benchmarked stage at one scale."""
+    out = []
+
+    # ── Sheets: values -> DataFrame, then the fetch-time cleaning ──
+    for key, name in data.SHEETS.items():
+        n = len(frames[key])
+        out.append(("Sheets", f"read:{key}", n, lambda name=name: data.read_worksheet(sheet, name)))
+        if key in data.CLEANERS:
+            raw = data.read_worksheet(sheet, name)
+            out.append(("Sheets", f"clean:{key}", n, lambda key=key, raw=raw: data.CLEANERS[key](raw.copy())))
+
+    # ── Breadth ──
+    m = breadth.mapping["52 Week Data"]
+    out.append(("Breadth Data", "parse", len(frames["df_main"]), lambda: breadth.parse_dataset(frames["df_main"], m)))
+    parsed = breadth.parse_dataset(frames["df_main"], m).rename(columns={m["date"]: "Date"})
+    out += chart_stages("Breadth Data", parsed, m["hl"])
+
+    # ── RBI / Index OI / Index valuation / Global rates / India macro (already typed at fetch) ──
+    out.append(("RBI Net Liquidity Injected", "parse", len(frames["df_rbi"]),
+                lambda: rbi_liquidity.parse(frames["df_rbi"])))
+    out += chart_stages("RBI Net Liquidity Injected", rbi_liquidity.parse(frames["df_rbi"])[0], "Net Liquidity")
+
+    oi = frames["df_index_oi"]
+    out += chart_stages("Index Futures OI", oi[["Date_1", "Index Futures OI"]].dropna()
+                        .rename(columns={"Date_1": "Date"}), "Index Futures OI")
+
+    val = frames["df_index_val"]
+    out += chart_stages("Index (PE / PB / DIV YLD)", val[["Date_1", "P/E_1"]].dropna()
+                        .rename(columns={"Date_1": "Date", "P/E_1": "P/E"}), "P/E")
+
+    rates = frames["df_global_rates"]
+    out += chart_stages("Global Interest Rates", rates[["Date_1", "Int_1"]].dropna()
+                        .rename(columns={"Date_1": "Date", "Int_1": "Interest Rate"}), "Interest Rate")
+
+    out.append(("India Macroeconomic Indicators", "parse", len(frames["df_india_macro"]),
+                lambda: india_macro.parse(frames["df_india_macro"])))
+    out += chart_stages("India Macroeconomic Indicators", india_macro.parse(frames["df_india_macro"])[1], "Value")
+
+    # ── Net MTF ──
+    out.append(("Net MTF Outstanding", "parse", len(frames["df_mtf"]),
+                lambda: mtf.parse_series(frames["df_mtf"], "DATE_1", "NET MTF OUTSTANDING", "Net MTF")))
+    out += chart_stages("Net MTF Outstanding",
+                        mtf.parse_series(frames["df_mtf"], "DATE_1", "NET MTF OUTSTANDING", "Net MTF"), "Net MTF")
+
+    # ── Auto Dashboard: series extraction + template injection ──
+    out.append(("Auto Dashboard", "template", len(frames["df_auto_sales"]),
+                lambda: auto_dashboard.build_html(frames["df_auto_sales"].copy())))
+
+    # ── Nifty returns: parse + matrix HTML ──
+    out.append(("Nifty 50 Fwd & Bwd Returns", "parse", len(frames["df_nifty_ret"]),
+                lambda: nifty_returns.parse(frames["df_nifty_ret"])))
+    ret = nifty_returns.parse(frames["df_nifty_ret"]).sort_values("Date", ascending=False)
+    out.append(("Nifty 50 Fwd & Bwd Returns", "matrix", len(ret), lambda: nifty_returns.matrix_rows_html(ret)))
+
+    return out
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales=SCALES, repeat=3, seed=0, only=None):
+    results = []
+    for scale in scales:
+        sheet = fixtures.FakeSpreadsheet(scale, seed)
+        frames = fixtures.sheet_frames(sheet=sheet)
+        for view, stage, rows, fn in cases(frames, sheet):
+            if only and only.lower() not in view.lower():
+                continue
+            best, median = timed(fn, repeat)
+            results.append({"scale": scale, "view": view, "stage": stage, "rows": rows,
+                            "min_ms": round(best, 3), "median_ms": round(median, 3)})
+            print(f"{scale:>4}×  {view:32s} {stage:24s} {rows:>8} rows  {median:10.2f} ms")
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "plotly": plotly.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=1.2):
+    """Print median ratios against a baseline run; returns the stages slower than threshold×."""
+    base = {(r["scale"], r["view"], r["stage"]): r["median_ms"] for r in baseline["results"]}
+    slower = []
+    for r in current["results"]:
+        old = base.get((r["scale"], r["view"], r["stage"]))
+        if not old:
+            continue
+        ratio = r["median_ms"] / old
+        flag = "  SLOWER" if ratio > threshold else ""
+        print(f"{r['scale']:>4}×  {r['view']:32s} {r['stage']:24s} {old:10.2f} -> {r['median_ms']:10.2f} ms  ×{ratio:.2f}{flag}")
+        if flag:
+            slower.append(r)
+    return slower
+
+
+# =================================================
+# CLI — python benchmark.py [--scales 1 10 100] [--out results.json] [--compare old.json]
+# =================================================
+# Results go to bench/ (gitignored) unless --out says otherwise.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time each view's pipeline stages on synthetic sheets.")
+    parser.add_argument("--scales", type=float, nargs="+", default=list(SCALES),
+                        help="history multipliers relative to today's sheet sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--view", help="only views whose name contains this text")
+    parser.add_argument("--out", default=os.path.join("bench", f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"))
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="ratio reported as a regression")
+    args = parser.parse_args()
+
+    report = run(args.scales, args.repeat, args.seed, args.view)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            slower = compare(json.load(f), report, args.threshold)
+        raise SystemExit(1 if slower else 0)
@@ -0,0 +1,105 @@
+import argparse
+import os
+import zipfile
+from datetime import datetime
+
+import image_pipeline
+
+# =================================================
+# SNAPSHOT NAMES — <SYMBOL>_<YYYY-MM-DD>_<HH-MM-SS>.png
+# =================================================
+# Superseded snapshots are packed into this zip inside each chart folder. Zip's
+# central directory is the index: any single member can be read without
+# touching the rest of the archive.
+ARCHIVE_NAME = "_archive.zip"
+
+
+def parse_snapshot(filename):
+    """Split a chart filename into (symbol, timestamp); unparseable names get datetime.min."""
+    stem = os.path.splitext(filename)[0]
+    parts = stem.rsplit("_", 2)
+    if len(parts) == 3:
+        try:
+            return parts[0], datetime.strptime(f"{parts[1]}_{parts[2]}", "%Y-%m-%d_%H-%M-%S")
+        except ValueError:
+            pass
+    return stem, datetime.min
+
+
+def split_latest(images):
+    """Partition chronologically sorted filenames into (latest per symbol, superseded)."""
+    latest = {}
+    for img in images:
+        latest[parse_snapshot(img)[0]] = img
+    keep = set(latest.values())
+    return [i for i in images if i in keep], [i for i in images if i not in keep]
+
+
+# =================================================
+# ARCHIVE
+# =================================================
+def archive_path(folder):
+    return os.path.join(folder, ARCHIVE_NAME)
+
+
+def list_archived(folder):
+    """Archived snapshot names, newest first."""
+    path = archive_path(folder)
+    if not os.path.exists(path):
+        return []
+    with zipfile.ZipFile(path) as zf:
+        names = zf.namelist()
+    return sorted(names, key=lambda n: parse_snapshot(n)[1], reverse=True)
+
+
+def read_archived(folder, name):
+    """Bytes of one archived snapshot (random access through the zip index)."""
+    with zipfile.ZipFile(archive_path(folder)) as zf:
+        return zf.read(name)
+
+
+def archive_folder(folder, dry_run=False):
+    """Move every superseded snapshot in folder into its archive. Returns the moved names."""
+    images = sorted(
+        (f for f in os.listdir(folder) if f.lower().endswith(image_pipeline.IMAGE_EXTENSIONS)),
+        key=lambda f: parse_snapshot(f)[1],
+    )
+    _, superseded = split_latest(images)
+    if dry_run or not superseded:
+        return superseded
+
+    with zipfile.ZipFile(archive_path(folder), "a", compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=9) as zf:
+        existing = set(zf.namelist())
+        for name in superseded:
+            if name not in existing:
+                zf.write(os.path.join(folder, name), name)
+
+    # Only delete once the archive has been closed and every member verifies
+    with zipfile.ZipFile(archive_path(folder)) as zf:
+        if zf.testzip() is not None:
+            raise RuntimeError(f"archive verification failed: {archive_path(folder)}")
+        archived = set(zf.namelist())
+    for name in superseded:
+        if name in archived:
+            os.remove(os.path.join(folder, name))
+    return superseded
+
+
+# =================================================
+# CLI — python chart_archive.py [roots...] [--dry-run]
+# =================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack superseded chart snapshots into per-folder zip archives.")
+    parser.add_argument("roots", nargs="*", default=["asset_class_charts", "metal_charts", "multiasset_charts"])
+    parser.add_argument("--dry-run", action="store_true", help="only list what would be archived")
+    args = parser.parse_args()
+
+    total = 0
+    for root in args.roots:
+        for dirpath, _, _ in os.walk(root):
+            moved = archive_folder(dirpath, dry_run=args.dry_run)
+            for name in moved:
+                print(os.path.join(dirpath, name))
+            total += len(moved)
+    print(f"{total} superseded snapshots {'would be ' if args.dry_run else ''}archived")
@@ -0,0 +1,153 @@
+import os
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import downloads
+import metrics
+import perf
+import prefetch
+
+# =================================================
+# PLOT FUNCTION — MINIMAL PLOTLY THEME
+# =================================================
+PLOT_LAYOUT = dict(
+    template="plotly_white",
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    autosize=True,
+    font=dict(family="DM Sans, sans-serif", size=12, color="#1a1a18"),
+    title_font=dict(family="DM Sans, sans-serif", size=13, color="#6b6b64"),
+    title_x=0.5,
+    hovermode="x unified",
+    margin=dict(l=0, r=0, t=52, b=40),   # zero side margins — no whitespace
+    xaxis=dict(
+        showgrid=False,
+        zeroline=False,
+        showline=False,
+        tickfont=dict(family="DM Mono, monospace", size=10, color="#a0a09a"),
+        tickcolor="#e8e8e5",
+        automargin=True,
+    ),
+    yaxis=dict(
+        gridcolor="#f0f0ed",
+        gridwidth=1,
+        zeroline=False,
+        showline=False,
+        tickfont=dict(family="DM Mono, monospace", size=10, color="#a0a09a"),
+        tickformat=",",
+        showexponent="none",
+        automargin=True,
+    ),
+    legend=dict(
+        orientation="h",
+        yanchor="bottom",
+        y=1.02,
+        xanchor="left",
+        x=0,
+        font=dict(size=11),
+        bgcolor="rgba(255,255,255,0)",
+    ),
+    hoverlabel=dict(
+        bgcolor="white",
+        bordercolor="#e8e8e5",
+        font=dict(family="DM Mono, monospace", size=11),
+    ),
+)
+
+LINE_COLOR = "#1a56db"
+GREEN = "#16a34a"
+RED   = "#dc2626"
+
+CHART_HEIGHT = 520
+
+
+def line_figure(df, x, y, height=CHART_HEIGHT, y_label=None, title=None, color=None):
+    """The themed single-line Plotly figure (no Streamlit calls, so it can be benchmarked)."""
+    fig = px.line(df, x=x, y=y)
+    line_color = color if color else LINE_COLOR
+    fig.update_traces(
+        line=dict(width=1.8, color=line_color),
+        hovertemplate="<b>%{x|%d %b %Y}</b><br>%{y:,.2f}<extra></extra>",
+    )
+    layout = dict(**PLOT_LAYOUT, height=height, yaxis_title=y_label, title=title)
+    fig.update_layout(**layout)
+    fig.update_yaxes(tickformat=",", showexponent="none")
+    return fig
+
+
+# =================================================
+# FIGURE CACHE — one figure per chart and data, shared by every session
+# =================================================
+# Keyed by the build function, the plotted frame's contents and the other
+# arguments, so a session opening a view somebody else (or the prefetcher)
+# has already drawn with the same data and widget values gets it back instead
+# of building it again. Least recently used figures are evicted past
+# FIGURE_CACHE_ENTRIES. Figures are shared: treat them as read-only.
+FIGURE_CACHE_ENTRIES = int(os.environ.get("FIGURE_CACHE_ENTRIES", 256))
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _figure(name, df, args, _build, _built):
+    prefetch.checkpoint()
+    _built.append(name)
+    with metrics.timer("figure_build_seconds"):
+        return _build(df, *args)
+
+
+def cached_figure(build, df, *args):
+    """build(df, *args), built once per distinct data and arguments across all sessions."""
+    built = []
+    fig = _figure(f"{build.__module__}.{build.__qualname__}", df, args, build, built)
+    metrics.cache("figures", not built)
+    return fig
+
+
+def plot_single_line(df, x, y, height=CHART_HEIGHT, y_label=None, title=None,
+                     color=None, key=None, date_range=None):
+    # Apply date range filter if provided
+    if date_range is not None and x in df.columns:
+        start, end = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
+        df = df[(df[x] >= start) & (df[x] <= end)]
+
+    with perf.stage("figure"):
+        fig = cached_figure(line_figure, df, x, y, height, y_label, title, color)
+    perf.count("rows.plotted", len(df))
+    if perf.enabled():  # serialising the figure is only worth it while measuring
+        perf.count("bytes.figures", len(fig.to_json()))
+    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False}, key=key)
+    downloads.chart_menu(df[[x, y]], title or y, key or downloads.slug(f"{title}_{y}"))
+
+
+# =================================================
+# DATE FILTER + TIMEFRAME
+# =================================================
+def date_filter_widget(df_dates, key):
+    """Render a date range + timeframe selector. Returns (start, end, resample_freq)."""
+    d_min = df_dates.min().date() if not df_dates.empty else pd.Timestamp("2010-01-01").date()
+    d_max = df_dates.max().date() if not df_dates.empty else pd.Timestamp.today().date()
+    c1, c2 = st.columns([4, 1])
+    with c1:
+        dr = st.date_input("Date range", [d_min, d_max],
+                           min_value=d_min, max_value=d_max,
+                           key=f"dr_{key}", label_visibility="collapsed")
+    with c2:
+        tf = st.selectbox("TF", ["D", "W", "M", "Q", "Y"],
+                          key=f"tf_{key}", label_visibility="collapsed")
+    start = pd.to_datetime(dr[0]) if len(dr) == 2 else pd.to_datetime(d_min)
+    end   = pd.to_datetime(dr[1]) if len(dr) == 2 else pd.to_datetime(d_max)
+    tf_map = {"D": None, "W": "W", "M": "ME", "Q": "QE", "Y": "YE"}
+    return start, end, tf_map[tf]
+
+
+def apply_tf(df, date_col, freq):
+    """Resample a dataframe by frequency using last value of each period."""
+    if freq is None or df.empty:
+        return df
+    perf.count("rows.resampled", len(df))
+    with perf.stage("apply_tf"):
+        numeric_cols = df.select_dtypes(include="number").columns.tolist()
+        df = df.set_index(date_col).sort_index()
+        df = df[numeric_cols].resample(freq).last().dropna(how="all").reset_index()
+    return df
@@ -0,0 +1,302 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+import gspread
+import pandas as pd
+import requests
+import streamlit as st
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import metrics
+import perf
+import snapshot
+
+# =================================================
+# SHEETS — session key -> worksheet name
+# =================================================
+SPREADSHEET_ID = "13UqMshnNj01OTGpsEjw7t1TEYZt6rBNpPWcTxLV2ZzM"
+
+SHEETS = {
+    "df_main":         "comparision charts",
+    "df_rbi":          "Rbi net liquidity",
+    "df_index_oi":     "Index oi charts",
+    "df_index_val":    "index (pe/pb/divyld)",
+    "df_tariff":       "Tariff_Timeline",
+    "df_global_rates": "Global interest rates",
+    "df_india_macro":  "India macroeconomic indicators",
+    "df_auto_sales":   "AUTOMOBILE SALES VOLUME",
+    "df_mtf":          "mtf outstanding",
+    "df_nifty_ret":    "Nifty_50 Fwd&Bwd Returns",
+}
+
+
+# =================================================
+# LOAD DATA (GOOGLE SHEETS – MULTI SHEET)
+# =================================================
+@st.cache_resource(show_spinner=False)
+def open_spreadsheet():
+    """The spreadsheet through one authorized client per process, over a pooled HTTP session."""
+    scopes = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+
+    creds = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"],
+        scopes=scopes
+    )
+
+    session = AuthorizedSession(creds)
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=len(SHEETS)))
+    client = gspread.authorize(creds, session=session)
+    return with_backoff(lambda: client.open_by_key(SPREADSHEET_ID), "open")
+
+
+# Only the runs of named header columns are requested — empty spacer columns
+# never leave the API — as raw numbers and serial-number dates, column-major.
+# Columns whose header starts with "date" are converted from the serial epoch.
+VALUE_PARAMS = {
+    "valueRenderOption": "UNFORMATTED_VALUE",
+    "dateTimeRenderOption": "SERIAL_NUMBER",
+    "majorDimension": "COLUMNS",
+}
+SERIAL_EPOCH = pd.Timestamp("1899-12-30")  # day 0 of Sheets serial dates
+
+
+def _column_letter(col):
+    return gspread.utils.rowcol_to_a1(1, col)[:-1]
+
+
+def column_ranges(sheet, sheet_name):
+    """A1 ranges covering each run of non-empty header cells in row 1."""
+    header = sheet.values_get(gspread.utils.absolute_range_name(sheet_name, "1:1")).get("values", [[]])[0]
+    ranges, start = [], None
+    for i, h in enumerate(header + [""], start=1):
+        if str(h).strip() and start is None:
+            start = i
+        elif not str(h).strip() and start is not None:
+            ranges.append(gspread.utils.absolute_range_name(
+                sheet_name, f"{_column_letter(start)}:{_column_letter(i - 1)}"))
+            start = None
+    return ranges
+
+
+def _column(name, cells):
+    """Typed Series for one column: datetime64 for date columns, float where mostly numeric, else text."""
+    s = pd.Series(cells, dtype=object).replace("", None)
+    num = pd.to_numeric(s, errors="coerce")
+    if name.lower().startswith("date"):
+        dates = SERIAL_EPOCH + pd.to_timedelta(num, unit="D")
+        text = s[num.isna() & s.notna()]  # typed as text in the sheet, not as a date
+        if len(text):
+            dates[text.index] = pd.to_datetime(text.astype(str), format="mixed", dayfirst=True, errors="coerce")
+        return dates
+    return num if num.count() * 2 >= s.count() else s
+
+
+def read_worksheet(sheet, sheet_name):
+    ranges = column_ranges(sheet, sheet_name)
+    if not ranges:
+        return pd.DataFrame()
+
+    columns = {}
+    for value_range in sheet.values_batch_get(ranges, params=VALUE_PARAMS).get("valueRanges", []):
+        for cells in value_range.get("values", []):
+            name = str(cells[0]).strip().replace("\u00a0", " ")
+            columns[name] = _column(name, cells[1:])
+
+    return pd.DataFrame(columns)
+
+
+# =================================================
+# CLEANING — applied once, right after a sheet is fetched
+# =================================================
+NUMERIC_COLS_MAIN = [
+    "HIGH 1", "LOW 1", "H/L 1", "H RATIO 1", "L RATIO 1",
+    "HIGH 2", "LOW 2", "H/L 2", "H RATIO 2", "L RATIO 2",
+    "HIGH 3", "LOW 3", "H/L 3", "H RATIO 3", "L RATIO 3"
+]
+
+NUMERIC_COLS_OI = [
+    "Index Futures OI", "Nifty Futures oi",
+    "Future Index Long", "Future Index Short",
+    "total client oi", "Client OI", "FII OI",
+]
+
+NUMERIC_COLS_RBI = ["NET LIQ INC TODAY", "AMOUNT"]
+
+
+def _to_numeric(df, cols):
+    for col in cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def clean_main(df):
+    df = _to_numeric(df, NUMERIC_COLS_MAIN)
+    return df.dropna(how="all", subset=[c for c in NUMERIC_COLS_MAIN if c in df.columns])
+
+
+CLEANERS = {
+    "df_main":     clean_main,
+    "df_index_oi": lambda df: _to_numeric(df, NUMERIC_COLS_OI),
+    "df_rbi":      lambda df: _to_numeric(df, NUMERIC_COLS_RBI),
+}
+
+
+# =================================================
+# FETCH — retried with backoff, one request in flight per worksheet
+# =================================================
+# Quota (429) and server errors are retried with exponential backoff and full
+# jitter. Sessions asking for a worksheet that is already being fetched wait
+# for that request instead of issuing their own, and every successful fetch
+# is kept process-wide as the fallback for when the API keeps failing.
+RETRIES = 5
+BACKOFF_BASE = 1.0   # seconds before the first retry, doubled per attempt
+BACKOFF_CAP = 32.0
+RETRY_CODES = {429, 500, 502, 503, 504}
+
+_fetch_lock = threading.Lock()
+_inflight = {}   # key -> Future of the cleaned frame
+_last_good = {}  # key -> (cleaned frame, fetched at)
+
+
+def _retryable(e):
+    if isinstance(e, gspread.exceptions.APIError):
+        return e.code in RETRY_CODES
+    return isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def with_backoff(fn, sheet):
+    """fn(), retrying quota / transient errors up to RETRIES times."""
+    for attempt in range(RETRIES):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == RETRIES - 1 or not _retryable(e):
+                raise
+            metrics.inc("sheet_fetch_errors_total", sheet=sheet, outcome="retried")
+            time.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+
+
+def _fetch(key):
+    with perf.stage("sheets:open"):
+        sheet = open_spreadsheet()
+    with metrics.timer("sheet_fetch_seconds", sheet=SHEETS[key]):
+        df = with_backoff(lambda: read_worksheet(sheet, SHEETS[key]), SHEETS[key])
+    perf.count("rows.fetched", len(df))
+    if key in CLEANERS:
+        with perf.stage(f"clean:{key}"):
+            df = CLEANERS[key](df)
+    return df
+
+
+def fetch(key):
+    """Cleaned frame for one sheet; concurrent callers share a single request."""
+    with _fetch_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    metrics.cache("inflight", not leader)
+    if not leader:
+        return future.result()
+
+    try:
+        df = _fetch(key)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        _last_good[key] = (df, time.time())
+        future.set_result(df)
+        return df
+    finally:
+        with _fetch_lock:
+            del _inflight[key]
+
+
+# =================================================
+# SESSION DATA
+# =================================================
+# Sheets are fetched lazily — only the ones the selected view declares — and
+# kept in session_state, so switching views never re-fetches a loaded sheet.
+# Frames may be shared between sessions: treat them as read-only. With
+# SNAPSHOT_DIR set they come from the published snapshot, not the API, and a
+# session moves to a newly published version at the start of its next rerun.
+def load_sheets(keys):
+    """{key: cleaned DataFrame} for keys, fetching any this session hasn't loaded yet."""
+    snap = snapshot.current()
+    if snap is not None and data_version() not in (0, snap.version):
+        refresh()
+    missing = [k for k in keys if k not in st.session_state]
+    for k in keys:
+        metrics.cache("sheets", k not in missing)
+    if snap is not None and missing:
+        with perf.stage("snapshot:sheets"):
+            for k in missing:
+                st.session_state[k] = snap.sheet(k)
+        st.session_state.setdefault("data_version", snap.version)
+    elif missing:
+        with st.spinner("Loading data from Google Sheets…"):
+            for k in missing:
+                try:
+                    with perf.stage(f"sheets:{k}"):
+                        st.session_state[k] = fetch(k)
+                except Exception as e:
+                    if k not in _last_good:
+                        metrics.inc("sheet_fetch_errors_total", sheet=SHEETS[k], outcome="failed")
+                        st.error(f"Couldn't load \"{SHEETS[k]}\" from Google Sheets: {e}")
+                        st.stop()
+                    metrics.inc("sheet_fetch_errors_total", sheet=SHEETS[k], outcome="fallback")
+                    st.session_state[k], fetched = _last_good[k]
+                    st.warning(f"Couldn't refresh \"{SHEETS[k]}\" ({e}); showing the copy from "
+                               f"{datetime.fromtimestamp(fetched):%H:%M:%S}. Press ↺ Refresh to retry.")
+        st.session_state.setdefault("data_version", time.time_ns())
+    return {k: st.session_state[k] for k in keys}
+
+
+def data_version():
+    """Token identifying the session's current data; changes on every refresh."""
+    return st.session_state.get("data_version", 0)
+
+
+def refresh():
+    """Forget every loaded sheet and derived value; the next rerun re-fetches."""
+    for k in list(SHEETS) + ["_derived", "data_version"]:
+        st.session_state.pop(k, None)
+
+
+def derived(key, fn):
+    """fn() computed once per data version and kept in the session. Treat the result as read-only.
+
+    Outside a session (prefetch threads) st.session_state is a process-wide
+    stand-in that outlives every data version, so nothing is memoised there:
+    the value comes from the current snapshot, else fn().
+    """
+    if get_script_run_ctx(suppress_warning=True) is None:
+        snap = snapshot.current()
+        value = snap.derived(key) if snap is not None else None
+        metrics.cache("derived", value is not None)
+        return fn() if value is None else value
+
+    memo = st.session_state.setdefault("_derived", {})
+    metrics.cache("derived", key in memo)
+    if key in memo:
+        perf.count("derived.hit")
+        return memo[key]
+
+    perf.count("derived.miss")
+    snap = snapshot.current()
+    value = None
+    if snap is not None and data_version() in (0, snap.version):  # 0: nothing loaded yet
+        with perf.stage(f"snapshot:{key}"):
+            value = snap.derived(key)
+    if value is None:
+        with perf.stage(f"derived:{key}"):
+            value = fn()
+    memo[key] = value
+    return value
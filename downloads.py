@@ -0,0 +1,131 @@
+import contextlib
+import hashlib
+import io
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+import metrics
+
+# =================================================
+# SERIES DOWNLOADS — the frame behind any chart, as CSV or Parquet
+# =================================================
+# Each chart gets a "⬇ Data" menu serving exactly the frame it plots, after
+# the view's date filter and timeframe, and each view an "All series" ZIP of
+# every chart's frame in both formats. Files are encoded from the typed frame
+# only when a button is clicked (Streamlit calls the data callable then), and
+# the encoding is deterministic — fixed CSV formatting, Parquet without
+# library metadata, ZIP entries with a fixed timestamp — so the same data is
+# the same bytes. Encoded files are kept process-wide by a content
+# fingerprint for the last DOWNLOAD_CACHE_ENTRIES.
+DOWNLOAD_CACHE_ENTRIES = int(os.environ.get("DOWNLOAD_CACHE_ENTRIES", 64))
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+MIME = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet", "zip": "application/zip"}
+
+_lock = threading.Lock()
+_encoded = OrderedDict()  # (format, fingerprint) -> bytes, least recently used first
+_local = threading.local()
+
+
+def to_csv(df):
+    return df.to_csv(index=False, lineterminator="\n", date_format="%Y-%m-%d").encode("utf-8")
+
+
+def to_parquet(df):
+    table = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None)
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression="zstd")
+    return sink.getvalue().to_pybytes()
+
+
+ENCODERS = {"csv": to_csv, "parquet": to_parquet}
+
+
+def fingerprint(df):
+    """Digest of the frame's column names, dtypes and values."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def encode(df, fmt):
+    """df as CSV or Parquet bytes; the same data always gives the same bytes."""
+    key = (fmt, fingerprint(df))
+    with _lock:
+        hit = key in _encoded
+        if hit:
+            _encoded.move_to_end(key)
+            out = _encoded[key]
+    metrics.cache("downloads", hit)
+    if hit:
+        return out
+    out = ENCODERS[fmt](df)
+    with _lock:
+        _encoded[key] = out
+        while len(_encoded) > DOWNLOAD_CACHE_ENTRIES:
+            _encoded.popitem(last=False)
+    return out
+
+
+def slug(name):
+    return re.sub(r"[^\w.-]+", "_", str(name)).strip("_").lower() or "series"
+
+
+def to_zip(series):
+    """One ZIP with <name>.csv and <name>.parquet for every (name, df), in order."""
+    buf = io.BytesIO()
+    seen = {}
+    with zipfile.ZipFile(buf, "w") as z:
+        for name, df in series:
+            base = slug(name)
+            seen[base] = seen.get(base, 0) + 1
+            if seen[base] > 1:
+                base = f"{base}_{seen[base]}"
+            for fmt, compress in (("csv", zipfile.ZIP_DEFLATED), ("parquet", zipfile.ZIP_STORED)):
+                info = zipfile.ZipInfo(f"{base}.{fmt}", date_time=ZIP_DATE)
+                info.compress_type = compress
+                z.writestr(info, encode(df, fmt))
+    return buf.getvalue()
+
+
+# =================================================
+# WIDGETS
+# =================================================
+@contextlib.contextmanager
+def collect():
+    """Gather every series offered for download in the block: yields the [(name, df)] list."""
+    series = _local.series = []
+    try:
+        yield series
+    finally:
+        _local.series = None
+
+
+def chart_menu(df, name, key):
+    """"⬇ Data" menu under a chart: its frame as CSV or Parquet."""
+    collected = getattr(_local, "series", None)
+    if collected is not None:
+        collected.append((name, df))
+    with st.popover("⬇ Data", type="tertiary", key=f"dl_{key}"):
+        for fmt in ENCODERS:
+            st.download_button(fmt.upper() if fmt == "csv" else fmt.title(), lambda fmt=fmt: encode(df, fmt),
+                               file_name=f"{slug(name)}.{fmt}", mime=MIME[fmt], on_click="ignore",
+                               key=f"dl_{key}_{fmt}", use_container_width=True)
+
+
+def view_button(view, series):
+    """"⬇ All series" ZIP of every chart's frame in the view."""
+    if not series:
+        return
+    st.download_button(f"⬇ All series ({len(series)}) as ZIP", lambda: to_zip(series),
+                       file_name=f"{slug(view)}_series.zip", mime=MIME["zip"], on_click="ignore",
+                       type="tertiary", key="dl_view_zip")
@@ -0,0 +1,318 @@
+import io
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import xlsxwriter
+
+import data
+import fiscal
+import metrics
+import snapshot
+from charts import LINE_COLOR, GREEN, RED, apply_tf
+
+# =================================================
+# EXCEL EXPORT — the whole dashboard as one workbook
+# =================================================
+# One tab per view, its series side by side with a blank column between them
+# (like the source sheets) and a native Excel line chart per series to the
+# right. Auto sales add FY and FYTD tables, Nifty returns the returns matrix.
+# Every series is cut to the chosen period and resampled to the chosen
+# timeframe with the same apply_tf the charts use.
+#
+# XlsxWriter's constant_memory mode flushes each row to disk as soon as the
+# next one starts, so memory doesn't grow with history. Workbooks are built on
+# a background thread — the session keeps working and polls for the result —
+# and kept per (data version, period, timeframe) for the last
+# EXPORT_CACHE_ENTRIES exports, shared by every session on that data.
+EXPORT_CACHE_ENTRIES = int(os.environ.get("EXPORT_CACHE_ENTRIES", 8))
+
+PERIODS = {"All history": None, "10 years": 10, "5 years": 5, "3 years": 3, "1 year": 1}
+TIMEFRAMES = {"Daily": None, "Weekly": "W", "Monthly": "ME", "Quarterly": "QE", "Yearly": "YE"}
+CHART_COLORS = [LINE_COLOR, RED, GREEN, "#7c3aed", "#0891b2", "#e05c2a"]
+
+# One table on a tab: first column Date for a time series (charted and filtered), else a plain table
+Block = namedtuple("Block", ["title", "df", "resample"], defaults=[True])
+
+
+# =================================================
+# TABS — what each view shows, as plain frames
+# =================================================
+def _pair(df, date_col, val_col, name):
+    if date_col not in df.columns or val_col not in df.columns:
+        return None
+    return df[[date_col, val_col]].dropna().rename(columns={date_col: "Date", val_col: name})
+
+
+def tabs(sheets):
+    """[(tab name, [Block])] for every view with data, before filtering."""
+    from views import auto_dashboard, breadth, india_macro, mtf, nifty_returns, rbi_liquidity
+
+    out = []
+
+    blocks = []
+    for choice, name in breadth.breadth_key_map.items():
+        m = breadth.mapping[name]
+        df = breadth.parse_dataset(sheets["df_main"], m)
+        blocks.append(Block(choice, df.rename(columns={m["date"]: "Date", m["high"]: "High", m["low"]: "Low",
+                                                      m["hl"]: "High/Low", m["hr"]: "High / EMA 200",
+                                                      m["lr"]: "Low / EMA 200"})))
+    out.append(("Breadth", blocks))
+
+    rbi_1, rbi_2 = rbi_liquidity.parse(sheets["df_rbi"])
+    out.append(("RBI Liquidity", [Block("Net Liquidity Injected", rbi_1), Block("Durable Liquidity", rbi_2)]))
+
+    oi = sheets["df_index_oi"]
+    blocks = [Block(name, _pair(oi, d, v, name)) for d, v, name in [
+        ("Date_1", "Index Futures OI", "Index Futures OI"),
+        ("Date_2", "Nifty Futures oi", "Nifty Futures OI"),
+        ("Date_3", "total client oi", "Total Client OI"),
+    ]]
+    blocks.append(Block("Client OI vs FII OI", oi[["DATE_4", "Client OI", "FII OI"]].rename(columns={"DATE_4": "Date"})
+                        .dropna(subset=["Date"]).dropna(how="all", subset=["Client OI", "FII OI"])))
+    out.append(("Index OI", blocks))
+
+    val = sheets["df_index_val"]
+    blocks = []
+    for i, label in enumerate(["Nifty 50", "Midcap 100", "Smallcap 250"], start=1):
+        cols = {f"Date_{i}": "Date", f"P/E_{i}": "P/E", f"P/B_{i}": "P/B", f"Div Yield_{i}": "Dividend Yield"}
+        blocks.append(Block(label, val[list(cols)].dropna(subset=[f"Date_{i}"]).rename(columns=cols)))
+    out.append(("Valuation", blocks))
+
+    rates = sheets["df_global_rates"]
+    out.append(("Global Rates", [Block(country, _pair(rates, f"Date_{i}", f"Int_{i}", "Interest Rate"))
+                                 for i, country in enumerate(["US", "India", "UK", "China", "Japan"], start=1)]))
+
+    gdp, infl, loan = india_macro.parse(sheets["df_india_macro"])
+    out.append(("India Macro", [Block("GDP Growth %", gdp), Block("Inflation %", infl), Block("Loan Growth %", loan)]))
+
+    df_mtf = sheets["df_mtf"]
+    blocks = [Block("Net MTF Outstanding", mtf.parse_series(df_mtf, "DATE_1", "NET MTF OUTSTANDING", "Net MTF"))]
+    blocks += [Block(company, _pair(df_mtf, d, v, company)) for company, (d, v) in mtf.COMPANY_MTF_MAP.items()]
+    out.append(("MTF", blocks))
+
+    out.append(("Auto Sales", auto_blocks(sheets["df_auto_sales"], auto_dashboard.RAW_COLUMNS)))
+
+    ret = nifty_returns.parse(sheets["df_nifty_ret"])
+    out.append(("Nifty Returns", [Block("Forward & backward returns (%)", ret, resample=False)]))
+
+    return [(tab, [b for b in blocks if b.df is not None and len(b.df)]) for tab, blocks in out]
+
+
+def dated_series(sheets):
+    """(tab, block title, field, Date / value frame) for every numeric column of every dated block."""
+    for tab, blocks in tabs(sheets):
+        for block in blocks:
+            df = block.df
+            if df.columns[0] != "Date":
+                continue
+            for field in df.columns[1:]:
+                if pd.api.types.is_numeric_dtype(df[field]):
+                    yield tab, block.title, field, df[["Date", field]].rename(columns={field: "value"})
+
+
+def auto_blocks(auto, columns):
+    """Monthly sales per company, plus FY totals and FY-to-date totals tables."""
+    series = {}
+    for company, (date_col, val_col) in columns.items():
+        if date_col in auto.columns and val_col in auto.columns:
+            s = auto[[date_col, val_col]].dropna()
+            series[company] = pd.Series(s[val_col].to_numpy(), index=s[date_col].to_numpy().astype("datetime64[M]"))
+    monthly = pd.DataFrame({c: s.groupby(level=0).last() for c, s in series.items()}).sort_index()
+    monthly = monthly.rename_axis("Date").reset_index()
+    monthly["Date"] = monthly["Date"].astype("datetime64[us]")
+
+    fy = {}
+    for company, s in series.items():
+        labels, totals = fiscal.fy_totals(s.index.to_numpy(), s.to_numpy())
+        fy[company] = pd.Series(totals, index=labels)
+    fy = pd.DataFrame(fy).rename_axis("FY").reset_index()
+
+    latest = monthly["Date"].max()
+    fytd = pd.DataFrame({
+        "Company": list(series),
+        fiscal.fy_labels([latest])[0] + " to date": [s[fiscal.fytd_mask(s.index.to_numpy(), latest)].sum()
+                                                      for s in series.values()],
+    })
+    return [Block("Monthly sales", monthly), Block("FY totals (April–March)", fy, resample=False),
+            Block("FY to date", fytd, resample=False)]
+
+
+def cut(block, period, timeframe):
+    """block restricted to the last period years and resampled to timeframe."""
+    df = block.df
+    if not pd.api.types.is_datetime64_any_dtype(df[df.columns[0]]):
+        return df
+    years, freq = PERIODS[period], TIMEFRAMES[timeframe]
+    if years:
+        df = df[df["Date"] >= df["Date"].max() - pd.DateOffset(years=years)]
+    df = df.sort_values("Date")
+    return apply_tf(df, "Date", freq) if block.resample else df
+
+
+# =================================================
+# WRITE — constant-memory XlsxWriter, row by row across the tab's blocks
+# =================================================
+def _cells(df):
+    """Rows as lists: dates as Excel serial numbers, missing values as None (blank)."""
+    cols = []
+    for name in df.columns:
+        values = df[name].to_numpy()
+        if values.dtype.kind == "M":
+            values = (values - np.datetime64(data.SERIAL_EPOCH)) / np.timedelta64(1, "D")
+        values = values.astype(object)
+        values[pd.isna(values)] = None
+        cols.append(values)
+    return np.column_stack(cols).tolist() if cols and len(df) else []
+
+
+def write_tab(wb, name, blocks, formats):
+    ws = wb.add_worksheet(name)
+    at, rows, dated, col = [], [], [], 0
+    for block in blocks:
+        at.append(col)
+        rows.append(_cells(block.df))
+        dated.append(pd.api.types.is_datetime64_any_dtype(block.df[block.df.columns[0]]))
+        col += len(block.df.columns) + 1
+
+    # header rows: title, column names
+    for block, c in zip(blocks, at):
+        ws.write_string(0, c, block.title, formats["title"])
+    for block, c, is_series in zip(blocks, at, dated):
+        ws.write_row(1, c, [str(n) for n in block.df.columns], formats["header"])
+        ws.set_column(c, c, 11 if is_series else 16)
+    for r in range(max(map(len, rows), default=0)):
+        for c, cells, is_series in zip(at, rows, dated):
+            if r < len(cells):
+                row = cells[r]
+                if is_series:
+                    if row[0] is not None:
+                        ws.write_number(r + 2, c, row[0], formats["date"])
+                    ws.write_row(r + 2, c + 1, row[1:], formats["number"])
+                else:
+                    ws.write_row(r + 2, c, row, formats["number"])
+
+    chart_row = 0
+    for block, c, cells, is_series in zip(blocks, at, rows, dated):
+        if not is_series or not cells:
+            continue
+        chart = wb.add_chart({"type": "line"})
+        last = len(cells) + 1
+        for j, series in enumerate(block.df.columns[1:], start=1):
+            chart.add_series({
+                "name": [name, 1, c + j],
+                "categories": [name, 2, c, last, c],
+                "values": [name, 2, c + j, last, c + j],
+                "line": {"width": 1.5, "color": CHART_COLORS[(j - 1) % len(CHART_COLORS)]},
+            })
+        chart.set_title({"name": block.title, "name_font": {"size": 11}})
+        chart.set_x_axis({"date_axis": True, "num_format": "mmm yy", "major_gridlines": {"visible": False}})
+        chart.set_y_axis({"major_gridlines": {"visible": True, "line": {"color": "#f0f0ed"}}})
+        chart.set_legend({"none": True} if len(block.df.columns) == 2 else {"position": "top"})
+        chart.set_size({"width": 720, "height": 300})
+        ws.insert_chart(chart_row, col, chart)
+        chart_row += 16
+
+
+def build(sheets, period, timeframe):
+    """The workbook as bytes."""
+    out = io.BytesIO()
+    with metrics.timer("export_build_seconds"):
+        wb = xlsxwriter.Workbook(out, {"constant_memory": True})
+        formats = {
+            "title": wb.add_format({"bold": True, "font_size": 12}),
+            "header": wb.add_format({"bold": True, "bottom": 1, "font_color": "#6b6b64"}),
+            "date": wb.add_format({"num_format": "dd-mmm-yyyy"}),
+            "number": wb.add_format({"num_format": "#,##0.00"}),
+        }
+        for name, blocks in tabs(sheets):
+            write_tab(wb, name, [b._replace(df=cut(b, period, timeframe)) for b in blocks], formats)
+        wb.close()
+    return out.getvalue()
+
+
+# =================================================
+# BACKGROUND BUILDS — one per (data version, period, timeframe)
+# =================================================
+_lock = threading.Lock()
+_exports = OrderedDict()  # key -> Future of the workbook bytes, least recently used first
+_pool = None
+
+
+def _build(version, sheets, period, timeframe):
+    snap = snapshot.current()
+    for k in data.SHEETS:
+        if k not in sheets:
+            sheets[k] = snap.sheet(k) if snap is not None else data.fetch(k)
+    return build(sheets, period, timeframe)
+
+
+def request(version, sheets, period, timeframe):
+    """Future of the workbook for these filters, starting a build unless one exists or is running."""
+    global _pool
+    key = (version, period, timeframe)
+    with _lock:
+        future = _exports.get(key)
+        hit = future is not None and not (future.done() and future.exception())
+        if hit:
+            _exports.move_to_end(key)
+        else:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(1, thread_name_prefix="export")
+            future = _exports[key] = _pool.submit(_build, version, dict(sheets), period, timeframe)
+            while len(_exports) > EXPORT_CACHE_ENTRIES:
+                _exports.popitem(last=False)
+    metrics.cache("export", hit)
+    return future
+
+
+# =================================================
+# PANEL — filters, build button, download when ready
+# =================================================
+@st.fragment(run_every=1.0)
+def _wait(future):
+    """Polls while the workbook builds, then reruns the app so the panel shows the download."""
+    if future.done():
+        st.rerun()
+    st.caption("Building workbook…")
+
+
+def _version():
+    """The data the export is built from: the published snapshot's version, else the session's."""
+    snap = snapshot.current()
+    return snap.version if snap is not None else data.data_version()
+
+
+@st.fragment
+def panel():
+    st.markdown("**Excel export**")
+    period = st.selectbox("Period", list(PERIODS), key="export_period")
+    timeframe = st.selectbox("Timeframe", list(TIMEFRAMES), key="export_tf")
+    key = (_version(), period, timeframe)
+
+    if st.button("Build workbook", key="export_build", use_container_width=True):
+        if snapshot.current() is None:  # no shared copy: this session's sheets, fetched now if need be
+            data.load_sheets(list(data.SHEETS))
+            key = (_version(), period, timeframe)
+        current = data.data_version() == key[0]
+        loaded = {k: st.session_state[k] for k in data.SHEETS if current and k in st.session_state}
+        st.session_state["export"] = (key, request(key[0], loaded, period, timeframe))
+
+    requested, future = st.session_state.get("export", (None, None))
+    if requested != key:
+        return
+    if not future.done():
+        _wait(future)
+    elif future.exception() is not None:
+        st.error(f"Export failed: {future.exception()}")
+    else:
+        st.download_button(
+            "⬇ Download .xlsx", future.result(), use_container_width=True,
+            file_name=f"daily_excel_dashboard_{datetime.now():%Y%m%d}_{period}_{timeframe}.xlsx".replace(" ", "_").lower(),
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
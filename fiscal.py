@@ -0,0 +1,72 @@
+from functools import lru_cache
+
+import numpy as np
+
+# =================================================
+# FISCAL CALENDAR — Indian financial year, April to March
+# =================================================
+# Everything works on whole months: dates (datetime64 arrays, Series or
+# "YYYY-MM" strings) become months since 1970-01, and FY ids and FYTD / TTM
+# windows are integer arithmetic on those. An FY id is the calendar year the
+# FY starts in (FY24-25 -> 2024). NaT gets FY id NO_FY and the label "".
+FY_START_MONTH = 4  # April
+NO_FY = -1
+
+
+def months(dates):
+    """int64 months since 1970-01 for each date; NaT -> the int64 minimum."""
+    return np.asarray(dates, dtype="datetime64[M]").view("i8")
+
+
+def _valid(m):
+    return m != np.iinfo(np.int64).min
+
+
+def fy_id(dates):
+    """FY id (start year) per date."""
+    m = months(dates)
+    return np.where(_valid(m), (m - (FY_START_MONTH - 1)) // 12 + 1970, NO_FY)
+
+
+@lru_cache(maxsize=None)
+def label(fy):
+    """'FY24-25' for FY id 2024."""
+    return "" if fy == NO_FY else f"FY{fy % 100:02d}-{(fy + 1) % 100:02d}"
+
+
+def labels(ids):
+    """Object array of labels for an array of FY ids, one label lookup per distinct id."""
+    uniq, inverse = np.unique(ids, return_inverse=True)
+    return np.array([label(int(fy)) for fy in uniq], dtype=object)[inverse.reshape(np.shape(ids))]
+
+
+def fy_labels(dates):
+    return labels(fy_id(dates))
+
+
+def fy_options(dates):
+    """Sorted labels of every FY the dates touch."""
+    return [label(int(fy)) for fy in np.unique(fy_id(dates)) if fy != NO_FY]
+
+
+def fytd_mask(dates, latest):
+    """True for dates from the start of latest's FY up to and including latest's month."""
+    m, end = months(dates), months([latest])[0]
+    return (m >= end - (end - (FY_START_MONTH - 1)) % 12) & (m <= end)
+
+
+def ttm_window(latest, n=12):
+    """(first, last) datetime64[M] of the n months ending with latest's month."""
+    end = np.asarray([latest], dtype="datetime64[M]")[0]
+    return end - np.timedelta64(n - 1, "M"), end
+
+
+def fy_totals(dates, values):
+    """(labels, totals) per FY in order; integer values give integer totals."""
+    values = np.asarray(values)
+    uniq, inverse = np.unique(fy_id(dates), return_inverse=True)
+    totals = np.bincount(inverse, weights=values, minlength=len(uniq))
+    if values.dtype.kind in "iu":
+        totals = totals.astype(values.dtype)
+    keep = uniq != NO_FY
+    return [label(int(fy)) for fy in uniq[keep]], totals[keep]
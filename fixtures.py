@@ -0,0 +1,227 @@
+import json
+import random
+import time
+from collections import namedtuple
+
+import gspread
+import numpy as np
+import pandas as pd
+import requests
+
+import data
+
+# =================================================
+# SYNTHETIC WORKSHEETS — same tabs, headers and value types as the live sheet
+# =================================================
+# A tab is a row of side-by-side blocks, each a date column followed by value
+# columns, with an empty spacer column between blocks like the real sheet.
+# Cells are what the values API returns with UNFORMATTED_VALUE and
+# SERIAL_NUMBER: numbers, serial-number dates, fractions for percentages.
+Block = namedtuple("Block", ["date_col", "freq", "rows", "columns", "style"])
+
+END = pd.Timestamp("2026-03-31")
+FIRST = pd.Timestamp("1678-01-01")  # datetime64[ns] bounds, with margin
+LAST = pd.Timestamp("2262-01-01")
+
+
+def _company_blocks(pairs, rows):
+    return [Block(d, "B", rows, [c], "int") for d, c in pairs]
+
+
+LAYOUTS = {
+    "comparision charts": [
+        Block(f"DATE {i}", "B", 1500,
+              [f"HIGH {i}", f"LOW {i}", f"H/L {i}", f"H RATIO {i}", f"L RATIO {i}"], "float")
+        for i in (1, 2, 3)
+    ],
+    "Rbi net liquidity": [
+        Block("DATE-1", "B", 1500, ["NET LIQ INC TODAY"], "int"),
+        Block("DATE_2", "W", 300, ["AMOUNT"], "int"),
+    ],
+    "Index oi charts": [
+        Block("Date_1", "B", 1200, ["Index Futures OI", "Future Index Long", "Future Index Short"], "int"),
+        Block("Date_2", "B", 1200, ["Nifty Futures oi"], "int"),
+        Block("Date_3", "B", 1200, ["total client oi"], "int"),
+        Block("DATE_4", "B", 1200, ["Client OI", "FII OI"], "int"),
+    ],
+    "index (pe/pb/divyld)": [
+        Block(f"Date_{i}", "B", 5000, [f"P/E_{i}", f"P/B_{i}", f"Div Yield_{i}"], "float")
+        for i in (1, 2, 3)
+    ],
+    "Tariff_Timeline": [
+        Block("Date", "W", 120, ["Country", "Measure", "Tariff %"], "text"),
+    ],
+    "Global interest rates": [
+        Block(f"Date_{i}", "MS", 650, [f"Int_{i}"], "float") for i in range(1, 6)
+    ],
+    "India macroeconomic indicators": [
+        Block("Date_1", "QS", 55, ["GDP %"], "float"),
+        Block("Date_2", "MS", 160, ["INFLATION %"], "float"),
+        Block("Date_3", "MS", 160, ["LOAN Growth %"], "float"),
+    ],
+    "AUTOMOBILE SALES VOLUME": [
+        Block(f"DATE_{i}", "MS", 145, cols, "int") for i, cols in enumerate([
+            ["TMPV TOTAL", "TMPV DOMESTIC SALES", "TMPV INTL SALES", "TMPV EV SALES", "TMPV ICE SALES"],
+            ["TMCV TOTAL SALES", "TMCV TOTAL DOMESTIC SALES", "TMCV INTL BUSINESS", "TMCV HCV TRUCKS",
+             "TMCV ILMCV TRUCKS", "TMCV PASSENGER CARRIERS", "TMCV SCV CARGO & PICKUP"],
+            ["M&M TOTAL PV", "M&M TOTAL SALES", "M&M UTILITY VEHICLES", "M&M DOMESTIC CV", "M&M TOTAL EXPORT",
+             "M&M LCV < 2T", "M&M LCV 2-3.5T", "M&M 3 W INC EV", "M&M TRACTOR DOMESTIC",
+             "M&M TRACTOR EXPORT", "M&M TRACTOR TOTAL"],
+            ["HYUNDAI TOTAL SALES", "HYUNDAI DOMESTIC SALES", "HYUNDAI EXPORT SALES"],
+            ["FORCE TOTAL SALES", "FORCE DOMESTIC SALES", "FORCE EXPORTSALES"],
+            ["SML MAHINDRA TOTAL SALES", "SML MAHINDRA CV", "SML MAHINDRA PV"],
+            ["MARUTI TOTAL SALES", "MARUTI PV", "MARUTI LCV", "MARUTI OEM", "MARUTI EXPORT"],
+            ["ATUL Total sales D+E", "ATUL Total Domestic sales", "ATUL Total 3w - IC Engine",
+             "ATUL Total EV L3", "ATUL Total EV L5", "ATUL Export 3w - IC Engine"],
+            ["AL TOTAL VEHICLES D+E", "AL TOTAL DOMESTIC VEHICLES", "AL DOMESTIC M&HCV TRUCKS",
+             "AL DOMESTIC M&HCV BUS", "AL DOMESTIC LCV", "AL TOTAL M&HCV EXPORT"],
+            ["Bajaj Total Sales D+E", "Bajaj 2W Domestic", "Bajaj 2W Export", "Bajaj Total 2W D+E",
+             "Bajaj CV Domestic", "Bajaj CV Export", "Bajaj Total CV D+E"],
+            ["Hero Total Sales D+E", "Hero Domestic Sales", "Hero Export Sales", "Hero Motorcycles Total",
+             "Hero Scooters Total"],
+            ["OLA Total Sales"],
+            ["Eicher Total Sales", "Eicher Less than 350 cc", "Eicher greater than 350 cc", "Eicher Total Export"],
+            ["Eicher CV Total Sales D+E", "Eicher CV Domestic sales", "Eicher CV Export Sales",
+             "Eicher CV Volvo Sales"],
+            ["TVS TOTAL SALES", "TVS 3W (TOTAL)", "TVS 3W DOMESTIC", "TVS 3W EXPORT", "TVS 2W (TOTAL)",
+             "TVS MOTORCYCLE (TOTAL)", "TVS SCOOTER (TOTAL)", "TVS EV (TOTAL)", "TVS TOTAL DOMESTIC",
+             "TVS TOTAL EXPORT", "TVS 2W DOMESTIC", "TVS 2W EXPORT"],
+        ], start=1)
+    ],
+    "mtf outstanding": (
+        [Block("DATE_1", "B", 500, ["NET MTF OUTSTANDING"], "int")]
+        + _company_blocks([(f"DATE_{i}", f"{c} MTF OUTSTANDING") for i, c in enumerate([
+            "HINDCOPPER", "SAIL", "NALCO", "GOLDBEES", "SILVERBEES", "BHARTIARTL", "SBIN", "ONGC", "M&M",
+            "COALINDIA", "NMDC", "CARBORUNDUM", "TMPV", "RELIANCE", "IDEA", "INDIGO", "KAJARIACER",
+            "CERA", "TATATECH", "AIAENG", "IRCTC"], start=2)], 500)
+    ),
+    "Nifty_50 Fwd&Bwd Returns": [
+        Block("Date", "MS", 300,
+              ["Price", "Bkw 1 YR", "Bkw 2 YR", "Bkw 3 YR", "Bkw 5 YR",
+               "Fwd 1yr", "Fwd 2yr", "Fwd 3yr", "Fwd 5yr"], "returns"),
+    ],
+}
+
+assert set(LAYOUTS) == set(data.SHEETS.values())
+
+
+# =================================================
+# GENERATION
+# =================================================
+PER_YEAR = {"B": 260, "W": 52, "MS": 12, "QS": 4}
+
+
+def _max_rows(freq):
+    """Periods of freq that fit between FIRST and LAST — the cap on scaled history."""
+    return PER_YEAR[freq] * (LAST.year - FIRST.year)
+
+
+def _dates(block, n):
+    """n periods of block.freq ending at END — or starting at FIRST once END - n would underflow."""
+    if block.freq == "B":  # weekday filter on a daily range; freq="B" itself is a slow Python loop
+        days = pd.date_range(end=END, periods=n * 7 // 5 + 7, freq="D")
+        if days[0] < FIRST:
+            days = pd.date_range(start=FIRST, periods=n * 7 // 5 + 7, freq="D")
+            return days[days.dayofweek < 5][:n]
+        return days[days.dayofweek < 5][-n:]
+    dates = pd.date_range(end=END, periods=n, freq=block.freq)
+    return dates if dates[0] >= FIRST else pd.date_range(start=FIRST, periods=n, freq=block.freq)
+
+
+def _values(rng, n, style, col):
+    walk = 100 + np.abs(np.cumsum(rng.normal(0, 1, n)))
+    if style == "int":
+        return (walk * 1000).astype(np.int64).tolist()
+    if style == "returns":
+        if col == "Price":
+            return np.round(walk * 100, 2).tolist()
+        return np.round(rng.normal(12, 15, n) / 100, 4).tolist()  # percent-formatted cells are fractions
+    if style == "text":
+        return [f"{col} {i}" for i in rng.integers(0, 50, n)]
+    return np.round(walk, 2).tolist()
+
+
+def worksheet_columns(name, scale=1, seed=0):
+    """Column-major cells (header first) for the named tab at scale× today's history; [] for spacers."""
+    rng = np.random.default_rng([seed, sum(map(ord, name))])
+    columns = []
+    for i, b in enumerate(LAYOUTS[name]):
+        if i:
+            columns.append([])
+        n = min(int(b.rows * scale), _max_rows(b.freq))
+        columns.append([b.date_col] + (_dates(b, n) - data.SERIAL_EPOCH).days.tolist())
+        columns += [[c] + _values(rng, n, b.style, c) for c in b.columns]
+    return columns
+
+
+def quota_error():
+    """The gspread APIError the Sheets API raises when the per-minute read quota is spent."""
+    response = requests.Response()
+    response.status_code = 429
+    response._content = json.dumps({"error": {
+        "code": 429,
+        "message": "Quota exceeded for quota metric 'Read requests' and limit 'Read requests per minute per user'",
+        "status": "RESOURCE_EXHAUSTED",
+    }}).encode()
+    return gspread.exceptions.APIError(response)
+
+
+class FakeSpreadsheet:
+    """Stand-in for a gspread Spreadsheet's values API over the synthetic tabs (generated once, on first use).
+
+    latency (seconds, ±50% jitter) and quota_rate (probability of a 429 per
+    request) make each call behave like a slow, rate-limited API.
+    """
+
+    def __init__(self, scale=1, seed=0, latency=0.0, quota_rate=0.0):
+        self.scale = scale
+        self.seed = seed
+        self.latency = latency
+        self.quota_rate = quota_rate
+        self._rng = random.Random(seed)
+        self._tabs = {}
+
+    def tab(self, name):
+        if name not in self._tabs:
+            self._tabs[name] = worksheet_columns(name, self.scale, self.seed)
+        return self._tabs[name]
+
+    def _request(self):
+        if self.latency:
+            time.sleep(self.latency * self._rng.uniform(0.5, 1.5))
+        if self.quota_rate and self._rng.random() < self.quota_rate:
+            raise quota_error()
+
+    def _grid(self, a1):
+        name, cells = a1.rsplit("!", 1)
+        grid = gspread.utils.a1_range_to_grid_range(cells)
+        return self.tab(name.strip("'").replace("''", "'")), grid
+
+    def values_get(self, range, params=None):
+        """Only the header-row form ('Tab'!1:1) that data.column_ranges asks for."""
+        self._request()
+        columns, _ = self._grid(range)
+        header = [c[0] if c else "" for c in columns]
+        while header and header[-1] == "":
+            header.pop()
+        return {"range": range, "majorDimension": "ROWS", "values": [header]}
+
+    def values_batch_get(self, ranges, params=None):
+        """Whole-column ranges ('Tab'!A:F), column-major."""
+        self._request()
+        out = []
+        for r in ranges:
+            columns, grid = self._grid(r)
+            out.append({"range": r, "majorDimension": "COLUMNS",
+                        "values": [list(c) for c in columns[grid["startColumnIndex"]:grid["endColumnIndex"]]]})
+        return {"valueRanges": out}
+
+
+def sheet_frames(scale=1, seed=0, sheet=None):
+    """{session key: cleaned DataFrame} for every tab, as data.load_sheets would store them."""
+    sheet = sheet or FakeSpreadsheet(scale, seed)
+    frames = {}
+    for key, name in data.SHEETS.items():
+        df = data.read_worksheet(sheet, name)
+        frames[key] = data.CLEANERS[key](df) if key in data.CLEANERS else df
+    return frames
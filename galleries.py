@@ -0,0 +1,138 @@
+import html
+import os
+
+import streamlit as st
+
+import chart_archive
+import image_pipeline
+import perf
+import snapshot
+
+# =================================================
+# IMAGE LOADER (CACHED – PERFORMANCE FIX)
+# =================================================
+def get_sorted_images(folder):
+    """Image names in folder, oldest snapshot first — from the data snapshot's listing when it has one."""
+    snap = snapshot.current()
+    listed = snap.images(folder) if snap is not None else None
+    return listed if listed is not None else scan_images(folder)
+
+
+def scan_images(folder):
+    if not os.path.exists(folder):
+        return []
+
+    images = [
+        f for f in os.listdir(folder)
+        if f.lower().endswith(image_pipeline.IMAGE_EXTENSIONS)
+    ]
+
+    return sorted(images, key=lambda f: chart_archive.parse_snapshot(f)[1])
+
+
+def show_snapshot_history(folder, superseded, key):
+    """History drawer: older snapshots of each symbol, rendered only while toggled on."""
+    archived = chart_archive.list_archived(folder)
+    n_older = len(superseded) + len(archived)
+    if not n_older or not st.toggle(f"History ({n_older} older snapshots)", key=f"{key}_history"):
+        return
+
+    if superseded:
+        show_html_gallery([os.path.join(folder, img) for img in reversed(superseded)], f"{key}_hist")
+    if archived:
+        name = st.selectbox("Archived snapshot", archived, key=f"{key}_archived")
+        with perf.stage("images:archive_read"):
+            img = chart_archive.read_archived(folder, name)
+        perf.count("bytes.images", len(img))
+        st.image(img, caption=name)
+
+
+# Prefetch the neighbouring item's renditions while the user looks at the current one
+PREFETCH_NEIGHBOURS = True
+
+
+def show_chart_gallery(base_folder, items, key):
+    """Radio-selected gallery: only the chosen item's images are sent to the browser."""
+    # Radio instead of tabs — st.tabs renders (and ships) every tab's images
+    choice = st.radio(key.title(), items, horizontal=True, key=f"{key}_item",
+                      label_visibility="collapsed")
+
+    latest_only = st.toggle("Latest per symbol", value=True, key=f"{key}_latest")
+
+    folder = os.path.join(base_folder, choice)
+    images = get_sorted_images(folder)
+    shown, superseded = chart_archive.split_latest(images) if latest_only else (images, [])
+    if not shown:
+        st.info("No charts available.")
+    else:
+        show_html_gallery([os.path.join(folder, img) for img in shown], f"{key}_{choice}",
+                          rendition="display", page_size=None, ncols=1)
+    show_snapshot_history(folder, superseded, f"{key}_{choice}")
+
+    if PREFETCH_NEIGHBOURS:
+        nxt = os.path.join(base_folder, items[(items.index(choice) + 1) % len(items)])
+        image_pipeline.prefetch([os.path.join(nxt, img) for img in get_sorted_images(nxt)])
+
+
+GALLERY_PAGE_SIZE = 12
+
+
+def show_html_gallery(paths, key, rendition="thumb", page_size=GALLERY_PAGE_SIZE, ncols=3,
+                      contact_sheet=False):
+    """One HTML grid of lazily loaded renditions served from stable static URLs.
+
+    Clicking a thumbnail opens the original. With more than page_size images a
+    page selector is shown; page_size=None renders everything (the browser still
+    only fetches images as they scroll into view). contact_sheet=True sends the
+    grid as a few composite images with a clickable overlay per chart instead.
+    """
+    if not paths:
+        st.info("No images available.")
+        return
+
+    with st.spinner("Preparing images…"), perf.stage("images:derivatives"):
+        digests = image_pipeline.ensure_derivatives(paths)
+    perf.count("images.prepared", len(paths))
+
+    if page_size and len(paths) > page_size:
+        n_pages = -(-len(paths) // page_size)
+        page = st.selectbox("Page", range(1, n_pages + 1), key=f"{key}_page",
+                            format_func=lambda p: f"Page {p} of {n_pages}",
+                            label_visibility="collapsed")
+        paths = paths[(page - 1) * page_size: page * page_size]
+
+    if contact_sheet:
+        show_contact_sheets(paths, digests, ncols)
+        return
+
+    cells = ""
+    for path in paths:
+        d = digests[path]
+        name = html.escape(os.path.splitext(os.path.basename(path))[0])
+        cells += (
+            f'<a href="{image_pipeline.url(path, digest=d)}" target="_blank" title="{name}">'
+            f'<img src="{image_pipeline.url(path, rendition, d)}" alt="{name}" loading="lazy" decoding="async">'
+            f'</a>'
+        )
+    grid = f'<div class="gallery-grid" style="--gallery-cols:{ncols}">{cells}</div>'
+    perf.count("bytes.html", len(grid))
+    st.markdown(grid, unsafe_allow_html=True)
+
+
+def show_contact_sheets(paths, digests, ncols):
+    """Render paths as composite sheets; a positioned link over each tile opens its original."""
+    with perf.stage("images:contact_sheets"):
+        sheets = image_pipeline.contact_sheets(paths, ncols, digests)
+    out = ""
+    for sheet, boxes in sheets:
+        links = ""
+        for path, (x, y, w, h) in boxes:
+            name = html.escape(os.path.splitext(os.path.basename(path))[0])
+            links += (
+                f'<a href="{image_pipeline.url(path, digest=digests[path])}" target="_blank" title="{name}" '
+                f'style="left:{x:.4%};top:{y:.4%};width:{w:.4%};height:{h:.4%}"></a>'
+            )
+        out += (f'<div class="contact-sheet"><img src="{image_pipeline.static_url(sheet)}" '
+                f'alt="Contact sheet" loading="lazy" decoding="async">{links}</div>')
+    perf.count("bytes.html", len(out))
+    st.markdown(out, unsafe_allow_html=True)
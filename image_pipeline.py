@@ -0,0 +1,376 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PIL import Image
+
+# =================================================
+# CONFIG
+# =================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+CHART_ROOTS = ["asset_class_charts", "metal_charts", "multiasset_charts", "magazine_cover"]
+
+# Derivatives live under static/ so Streamlit's static serving can hand them out later
+DERIVATIVE_DIR = os.path.join(BASE_DIR, "static", "derivatives")
+MANIFEST_PATH  = os.path.join(DERIVATIVE_DIR, "manifest.json")
+
+# URL prefix of DERIVATIVE_DIR: Streamlit static serving (.streamlit/config.toml)
+# by default, or IMAGE_BASE_URL when image_server.py fronts the folder
+STATIC_URL = os.environ.get("IMAGE_BASE_URL", "app/static/derivatives").rstrip("/")
+
+# rendition name -> max width in px (never upscaled)
+RENDITIONS = {
+    "thumb":   480,
+    "display": 1280,
+}
+WEBP_QUALITY = 80
+
+
+# =================================================
+# CONTENT HASH MANIFEST
+# =================================================
+# path -> {"size", "mtime_ns", "sha256"}; a file is only re-hashed when its
+# size or mtime changes, so lookups on every rerun cost one os.stat().
+_manifest = None
+_manifest_dirty = False
+_manifest_lock = threading.Lock()
+
+
+def _load_manifest():
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+                _manifest = json.load(f)
+        except (OSError, ValueError):
+            _manifest = {}
+    return _manifest
+
+
+def save_manifest():
+    """Persist the manifest if anything changed (atomic replace)."""
+    global _manifest_dirty
+    with _manifest_lock:
+        if not _manifest_dirty:
+            return
+        os.makedirs(DERIVATIVE_DIR, exist_ok=True)
+        tmp = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, MANIFEST_PATH)
+        _manifest_dirty = False
+
+
+def _hash_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def content_hash(path):
+    """sha256 of the file's bytes, served from the manifest when the file is unchanged."""
+    global _manifest_dirty
+    stat = os.stat(path)
+    with _manifest_lock:
+        entry = _load_manifest().get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+
+    digest = _hash_file(path)
+    with _manifest_lock:
+        _manifest[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        _manifest_dirty = True
+    return digest
+
+
+# =================================================
+# DERIVATIVES
+# =================================================
+def derivative_path(digest, rendition):
+    return os.path.join(DERIVATIVE_DIR, f"{digest[:20]}_{rendition}.webp")
+
+
+def original_path(digest, src):
+    """Content-addressed copy of the source image, so the original gets a stable URL too."""
+    return os.path.join(DERIVATIVE_DIR, f"{digest[:20]}{os.path.splitext(src)[1].lower()}")
+
+
+def _has_derivatives(digest, src):
+    return (os.path.exists(original_path(digest, src))
+            and all(os.path.exists(derivative_path(digest, r)) for r in RENDITIONS))
+
+
+def _publish_original(path, digest):
+    out = original_path(digest, path)
+    if os.path.exists(out):
+        return
+    tmp = f"{out}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        os.link(path, tmp)          # hard link: no extra disk space
+    except OSError:
+        shutil.copyfile(path, tmp)  # cross-device / unsupported filesystem
+    os.replace(tmp, out)
+
+
+def _render(path, digest):
+    """Write every missing rendition of one source image. Runs in a pool worker."""
+    try:
+        os.makedirs(DERIVATIVE_DIR, exist_ok=True)
+        _publish_original(path, digest)
+        with Image.open(path) as im:
+            im.load()
+            if im.mode not in ("RGB", "RGBA"):
+                im = im.convert("RGBA" if "transparency" in im.info or "A" in im.mode else "RGB")
+            for rendition, width in RENDITIONS.items():
+                out = derivative_path(digest, rendition)
+                if os.path.exists(out):
+                    continue
+                r = im
+                if im.width > width:
+                    r = im.resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+                tmp = f"{out}.{os.getpid()}-{threading.get_ident()}.tmp"
+                r.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+                os.replace(tmp, out)
+        return True
+    except OSError:
+        return False
+
+
+def ensure_derivatives(paths, workers=None, processes=False):
+    """Build missing renditions for paths in parallel. Returns {path: digest}.
+
+    processes=True uses a process pool (CLI prebuild). Inside the app a thread
+    pool is used instead: Streamlit registers app.py as __main__, so spawned
+    workers would re-run the whole script, and forking its threaded server is
+    unsafe. Pillow releases the GIL while decoding, resizing and encoding.
+    """
+    digests = {p: content_hash(p) for p in paths}
+
+    todo = {}
+    for p, d in digests.items():
+        if d not in todo.values() and not _has_derivatives(d, p):
+            todo[p] = d
+
+    if len(todo) == 1:
+        _render(*next(iter(todo.items())))
+    elif todo:
+        executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with executor(max_workers=workers) as pool:
+            list(pool.map(_render, todo.keys(), todo.values()))
+
+    save_manifest()
+    return digests
+
+
+def derivative(path, rendition, digest=None):
+    """Path of the rendition for path, falling back to the original if it could not be built."""
+    out = derivative_path(digest or content_hash(path), rendition)
+    return out if os.path.exists(out) else path
+
+
+def static_url(file_path):
+    return f"{STATIC_URL}/{os.path.basename(file_path)}"
+
+
+def url(path, rendition=None, digest=None):
+    """Stable static URL of a rendition (or of the original when rendition is None)."""
+    digest = digest or content_hash(path)
+    out = original_path(digest, path) if rendition is None else derivative_path(digest, rendition)
+    if not os.path.exists(out):
+        out = original_path(digest, path)
+    return static_url(out)
+
+
+# =================================================
+# CONTACT SHEETS — one composite WebP per grid (or per few rows)
+# =================================================
+SHEET_GAP = 8
+SHEET_MAX_ROWS = 6
+
+
+def _compose_sheet(thumbs, ncols, out):
+    """Tile thumbs into one WebP at out. Returns each tile's box as fractions of the sheet."""
+    ims = [Image.open(t) for t in thumbs]
+    try:
+        cell_w = RENDITIONS["thumb"]
+        rows = [ims[i:i + ncols] for i in range(0, len(ims), ncols)]
+        row_h = [max(im.height for im in row) for row in rows]
+        width  = ncols * cell_w + (ncols - 1) * SHEET_GAP
+        height = sum(row_h) + (len(rows) - 1) * SHEET_GAP
+
+        sheet = Image.new("RGB", (width, height), "white")
+        boxes = []
+        y = 0
+        for row, h in zip(rows, row_h):
+            x = 0
+            for im in row:
+                sheet.paste(im, (x, y), im if im.mode == "RGBA" else None)
+                boxes.append([x / width, y / height, im.width / width, im.height / height])
+                x += cell_w + SHEET_GAP
+            y += h + SHEET_GAP
+
+        tmp = f"{out}.{os.getpid()}-{threading.get_ident()}.tmp"
+        sheet.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+        os.replace(tmp, out)
+        return boxes
+    finally:
+        for im in ims:
+            im.close()
+
+
+def contact_sheets(paths, ncols=3, digests=None):
+    """Composite the thumbnails of paths into cached sheets of at most SHEET_MAX_ROWS rows.
+
+    Each sheet is keyed by a fingerprint of its members' content hashes and the
+    layout, so it is rebuilt only when the folder's images change.
+    Returns [(sheet_path, [(path, [x, y, w, h]), ...]), ...] with boxes as fractions.
+    """
+    digests = digests or ensure_derivatives(paths)
+    per_sheet = ncols * SHEET_MAX_ROWS
+    sheets = []
+    for i in range(0, len(paths), per_sheet):
+        chunk = paths[i:i + per_sheet]
+        fp = hashlib.sha256(f"{ncols}:{RENDITIONS['thumb']}:{SHEET_GAP}".encode())
+        for p in chunk:
+            fp.update(digests[p].encode())
+        out = os.path.join(DERIVATIVE_DIR, f"{fp.hexdigest()[:20]}_sheet.webp")
+        layout_path = out[:-len(".webp")] + ".json"
+
+        try:
+            with open(layout_path, "r", encoding="utf-8") as f:
+                boxes = json.load(f)
+        except (OSError, ValueError):
+            boxes = None
+        if boxes is None or not os.path.exists(out):
+            boxes = _compose_sheet([derivative(p, "thumb", digests[p]) for p in chunk], ncols, out)
+            with open(layout_path, "w", encoding="utf-8") as f:
+                json.dump(boxes, f)
+
+        sheets.append((out, list(zip(chunk, boxes))))
+    return sheets
+
+
+_prefetched = set()
+_prefetch_lock = threading.Lock()
+
+
+def prefetch(paths):
+    """Build renditions for paths on a background thread (once per process per set of paths)."""
+    key = tuple(paths)
+    with _prefetch_lock:
+        if not key or key in _prefetched:
+            return
+        _prefetched.add(key)
+    threading.Thread(target=ensure_derivatives, args=(list(paths),), daemon=True).start()
+
+
+# =================================================
+# INGEST — lossless PNG recompression
+# =================================================
+def _to_palette(im):
+    """Exact palette version of im when it has at most 256 colours, else None."""
+    if im.mode == "RGBA":
+        if im.getextrema()[3][0] < 255:
+            return None               # real transparency: keep truecolour
+        im = im.convert("RGB")
+    if im.mode != "RGB":
+        return None
+    colors = im.getcolors(256)
+    if colors is None:
+        return None
+
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([c for _, rgb in colors for c in rgb])
+    q = im.quantize(palette=palette, dither=Image.Dither.NONE)
+    return q if q.convert("RGB").tobytes() == im.tobytes() else None
+
+
+def _optimize_png(path):
+    """Losslessly recompress one PNG in place. Returns (original_size, optimized_size)."""
+    original = os.path.getsize(path)
+    try:
+        with Image.open(path) as im:
+            im.load()
+            out = _to_palette(im) or im.copy()
+        # Strip text/ICC/EXIF/pHYs chunks; transparency is pixel data, not metadata
+        out.info = {k: v for k, v in out.info.items() if k == "transparency"}
+        tmp = f"{path}.{os.getpid()}.tmp"
+        out.save(tmp, "PNG", optimize=True)
+        optimized = os.path.getsize(tmp)
+        if optimized < original:
+            os.replace(tmp, path)
+            return original, optimized
+        os.remove(tmp)
+    except OSError:
+        pass
+    return original, original
+
+
+def optimize_images(paths, workers=None):
+    """Recompress PNGs on a process pool, skipping content that was already processed.
+
+    Original and optimized sizes are recorded in the manifest entry of each file.
+    Returns {path: (original_size, optimized_size)} for the files processed.
+    """
+    global _manifest_dirty
+    with _manifest_lock:
+        done = {e["sha256"] for e in _load_manifest().values() if "optimized_size" in e}
+    todo = [p for p in paths if p.lower().endswith(".png") and content_hash(p) not in done]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(todo, pool.map(_optimize_png, todo)))
+
+    for path, (original, optimized) in results.items():
+        content_hash(path)  # re-hash the rewritten file
+        with _manifest_lock:
+            _manifest[path].update(original_size=original, optimized_size=optimized)
+            _manifest_dirty = True
+    save_manifest()
+    return results
+
+
+def iter_source_images(roots=CHART_ROOTS):
+    for root in roots:
+        for dirpath, _, files in os.walk(root):
+            for f in sorted(files):
+                if f.lower().endswith(IMAGE_EXTENSIONS):
+                    yield os.path.join(dirpath, f)
+
+
+# =================================================
+# CLI — ingest new charts and prebuild every derivative
+#   python image_pipeline.py [roots...] [--optimize] [--watch SECONDS]
+# =================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build WebP thumbnail/display renditions for chart images.")
+    parser.add_argument("roots", nargs="*", default=CHART_ROOTS, help="folders to scan")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--optimize", action="store_true",
+                        help="losslessly recompress PNGs (palette + max zlib, metadata stripped) first")
+    parser.add_argument("--watch", type=float, default=None, metavar="SECONDS",
+                        help="keep running, rescanning the folders every SECONDS")
+    args = parser.parse_args()
+
+    while True:
+        sources = list(iter_source_images(args.roots))
+        if args.optimize:
+            optimized = optimize_images(sources, workers=args.workers)
+            before = sum(o for o, _ in optimized.values())
+            after  = sum(n for _, n in optimized.values())
+            if optimized:
+                print(f"optimized {len(optimized)} PNGs: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
+        ensure_derivatives(sources, workers=args.workers, processes=True)
+        print(f"{len(sources)} images checked, derivatives in {DERIVATIVE_DIR}")
+
+        if args.watch is None:
+            break
+        time.sleep(args.watch)
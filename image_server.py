@@ -0,0 +1,64 @@
+import argparse
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import image_pipeline
+
+# Every file in DERIVATIVE_DIR is named after its content hash, so a URL's
+# bytes never change and browsers / proxies may cache them forever.
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ImmutableImageHandler(SimpleHTTPRequestHandler):
+    """Serves the content-addressed chart renditions with immutable caching headers."""
+
+    etag = None
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        name = os.path.basename(path)
+        if not os.path.isfile(path) or name == os.path.basename(image_pipeline.MANIFEST_PATH):
+            self.send_error(404, "File not found")
+            return None
+
+        self.etag = f'"{os.path.splitext(name)[0]}"'
+        if self.etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.end_headers()
+            return None
+        return super().send_head()
+
+    def end_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if self.etag:  # only hits are cacheable, never a 404
+            self.send_header("Cache-Control", CACHE_CONTROL)
+            self.send_header("ETag", self.etag)
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, host="0.0.0.0"):
+    """Start the image server on a daemon thread and return it."""
+    os.makedirs(image_pipeline.DERIVATIVE_DIR, exist_ok=True)
+    handler = partial(ImmutableImageHandler, directory=image_pipeline.DERIVATIVE_DIR)
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# =================================================
+# CLI — run standalone (e.g. behind nginx or a CDN origin)
+# =================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve chart renditions with immutable cache headers.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+
+    handler = partial(ImmutableImageHandler, directory=image_pipeline.DERIVATIVE_DIR)
+    print(f"Serving {image_pipeline.DERIVATIVE_DIR} on http://{args.host}:{args.port}")
+    ThreadingHTTPServer((args.host, args.port), handler).serve_forever()
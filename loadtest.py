@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import local_script_runner
+
+import data
+import fixtures
+import metrics
+import views
+from benchmark import git_revision
+
+# =================================================
+# LOAD TEST — N simulated sessions against a stand-in Sheets backend
+# =================================================
+# Each session is an AppTest of app.py clicking through a random but weighted
+# script of view switches and in-view widget changes. data.open_spreadsheet is
+# swapped for fixtures.FakeSpreadsheet, which adds per-fetch latency and 429
+# quota errors. AppTest installs a fresh runtime (and fresh st.cache_* storage)
+# for every run and is not thread-safe, so sessions take turns step by step:
+# all N stay alive — session state, derived frames, RSS — but reruns are
+# serial. Latency is per rerun as the user sees it, not under CPU contention.
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# How often a user opens each view, relative to 1 (the rest).
+VIEW_WEIGHTS = {
+    "Breadth Data": 4,
+    "Net MTF Outstanding": 3,
+    "Nifty 50 Fwd & Bwd Returns": 3,
+    "Index Futures OI": 2,
+    "RBI Net Liquidity Injected": 2,
+    "Auto Dashboard": 2,
+}
+SWITCH_PROBABILITY = 0.6  # otherwise change a timeframe / radio inside the current view
+
+
+# ── bytes sent: every rerun's ForwardMsgs pass through parse_tree_from_messages ──
+_sent = [0]
+_parse_tree = local_script_runner.parse_tree_from_messages
+
+
+def _counting_parse_tree(messages):
+    _sent[0] += sum(m.ByteSize() for m in messages)
+    return _parse_tree(messages)
+
+
+local_script_runner.parse_tree_from_messages = _counting_parse_tree
+
+
+class Session:
+    """One simulated user: an AppTest plus a private random script."""
+
+    def __init__(self, index, seed, timeout):
+        self.index = index
+        self.rng = random.Random(seed * 1000 + index)
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.bytes_sent = 0
+        self.steps = []
+
+    def _run(self, view, action, fn):
+        before = _sent[0]
+        t0 = time.perf_counter()
+        fn()
+        ms = (time.perf_counter() - t0) * 1000
+        sent = _sent[0] - before
+        self.bytes_sent += sent
+        errors = [e.message for e in self.at.exception] + [e.value for e in self.at.error]
+        stale = [w.value for w in self.at.warning if w.value.startswith("Couldn't refresh")]
+        self.steps.append({"view": view, "action": action, "ms": round(ms, 2), "bytes": sent,
+                           "errors": len(errors), "stale": len(stale),
+                           "quota": sum("[429]" in m for m in errors + stale)})
+
+    def start(self):
+        self._run(next(iter(views.VIEWS)), "open", self.at.run)
+
+    def step(self):
+        nav = self.at.selectbox[0]
+        controls = [w for w in self.at.selectbox if w.key and w.key.startswith("tf_")] + list(self.at.radio)
+        if not controls or self.rng.random() < SWITCH_PROBABILITY:
+            names = [n for n in views.VIEWS if n != nav.value]
+            target = self.rng.choices(names, [VIEW_WEIGHTS.get(n, 1) for n in names])[0]
+            self._run(target, "switch", lambda: nav.set_value(target).run())
+        else:
+            w = self.rng.choice(controls)
+            value = self.rng.choice([o for o in w.options if o != w.value] or w.options)
+            self._run(nav.value, f"set:{w.key}", lambda: w.set_value(value).run())
+
+
+def percentiles(ms):
+    return {"n": len(ms), "p50_ms": round(float(np.percentile(ms, 50)), 1),
+            "p95_ms": round(float(np.percentile(ms, 95)), 1)} if ms else {"n": 0}
+
+
+def run(sessions=10, steps=20, scale=1, latency=0.2, quota_rate=0.0, seed=0, timeout=120):
+    sheet = fixtures.FakeSpreadsheet(scale, seed, latency, quota_rate)
+    for name in data.SHEETS.values():  # generate the tabs up front, outside the timings
+        sheet.tab(name)
+    data.open_spreadsheet = lambda: sheet
+
+    baseline_rss = peak_rss = metrics.resident_memory()
+    users = [Session(i, seed, timeout) for i in range(sessions)]
+    for u in users:
+        u.start()
+        peak_rss = max(peak_rss, metrics.resident_memory())
+    for step in range(steps):
+        for u in users:
+            u.step()
+            peak_rss = max(peak_rss, metrics.resident_memory())
+        print(f"step {step + 1}/{steps}  rss {peak_rss / 2**20:.0f} MiB")
+
+    all_steps = [s for u in users for s in u.steps]
+    by_view = {}
+    for s in all_steps:
+        by_view.setdefault(s["view"], []).append(s["ms"])
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "sessions": sessions, "steps": steps, "scale": scale,
+            "latency_s": latency, "quota_rate": quota_rate, "seed": seed,
+        },
+        "rerun": percentiles([s["ms"] for s in all_steps]),
+        "views": {v: percentiles(ms) for v, ms in sorted(by_view.items())},
+        "rss": {"baseline_mib": round(baseline_rss / 2**20, 1), "peak_mib": round(peak_rss / 2**20, 1),
+                "per_session_mib": round((peak_rss - baseline_rss) / 2**20 / sessions, 1)},
+        "bytes_per_session": [u.bytes_sent for u in users],
+        "errors": sum(s["errors"] for s in all_steps),
+        "stale_fallbacks": sum(s["stale"] for s in all_steps),
+        "quota_errors": sum(s["quota"] for s in all_steps),
+        "steps_detail": [dict(s, session=u.index) for u in users for s in u.steps],
+    }
+
+
+def summary(report):
+    r, rss, sent = report["rerun"], report["rss"], report["bytes_per_session"]
+    print(f"\nreruns      {r['n']:>6}   p50 {r.get('p50_ms', 0):8.1f} ms   p95 {r.get('p95_ms', 0):8.1f} ms")
+    for view, v in report["views"].items():
+        print(f"  {view:32s} {v['n']:>4}   p50 {v['p50_ms']:8.1f} ms   p95 {v['p95_ms']:8.1f} ms")
+    print(f"peak RSS    {rss['peak_mib']:.1f} MiB (baseline {rss['baseline_mib']:.1f}, "
+          f"~{rss['per_session_mib']:.1f} MiB/session)")
+    print(f"bytes sent  mean {np.mean(sent) / 1024:.0f} KiB / session, max {max(sent) / 1024:.0f} KiB")
+    print(f"errors      {report['errors']} failed, {report['stale_fallbacks']} served stale "
+          f"({report['quota_errors']} quota)")
+
+
+# =================================================
+# CLI — python loadtest.py [--sessions 10] [--steps 20] [--latency 0.2] [--quota-rate 0.05]
+# =================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive simulated sessions against stand-in Google Sheets.")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=20, help="view switches / widget changes per session")
+    parser.add_argument("--scale", type=float, default=1, help="sheet history multiplier (see fixtures)")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per worksheet fetch, ±50%%")
+    parser.add_argument("--quota-rate", type=float, default=0.0, help="probability a fetch fails with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--out", help="also write the full report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.sessions, args.steps, args.scale, args.latency, args.quota_rate, args.seed, args.timeout)
+    summary(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.out}")
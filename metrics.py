@@ -0,0 +1,255 @@
+import bisect
+import contextlib
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =================================================
+# PROCESS-WIDE METRICS — aggregated across all sessions
+# =================================================
+# Unlike perf (per-rerun, opt-in), these are always collected: each sample is
+# one lock acquisition and an append. Exposed in Prometheus text format on
+# METRICS_PORT and/or written to METRICS_FILE every METRICS_INTERVAL seconds.
+PREFIX = "dashboard"
+
+FAMILIES = {
+    "sheet_fetch_seconds":      ("summary",   "Google Sheets worksheet fetch latency."),
+    "sheet_fetch_errors_total": ("counter",   "Failed worksheet fetches by outcome (retried, fallback, failed)."),
+    "figure_build_seconds":     ("histogram", "Plotly figure build time (figure cache misses)."),
+    "rerun_seconds":            ("histogram", "View rerun duration (full or fragment)."),
+    "export_build_seconds":     ("histogram", "Excel workbook export build time."),
+    "query_seconds":            ("histogram", "SQL Query view execution time (result cache misses)."),
+    "cache_requests_total":     ("counter",   "Cache lookups by layer and result."),
+    "prefetch_total":           ("counter",   "Background view prefetches by outcome (queued, done, cancelled, over_budget, failed)."),
+    "active_sessions":          ("gauge",     "Connected Streamlit sessions."),
+    "resident_memory_bytes":    ("gauge",     "Resident set size of the server process."),
+    "ready":                    ("gauge",     "1 once every readiness check passes (warm-up succeeded)."),
+}
+
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+SUMMARY_WINDOW = 1024  # quantiles are over the most recent samples per series
+
+_lock = threading.Lock()
+_series = {}  # (name, labels) -> state; labels is a sorted tuple of (key, value)
+READY_CHECKS = []  # callables; /ready answers 200 once all return True
+_sessions = 0
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def observe(name, value, **labels):
+    """Record one sample into a summary or histogram family."""
+    kind = FAMILIES[name][0]
+    with _lock:
+        s = _series.get(_key(name, labels))
+        if s is None:
+            s = _series[_key(name, labels)] = (
+                {"window": deque(maxlen=SUMMARY_WINDOW), "sum": 0.0, "count": 0} if kind == "summary"
+                else {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+            )
+        if kind == "summary":
+            s["window"].append(value)
+        else:
+            i = bisect.bisect_left(BUCKETS, value)
+            if i < len(BUCKETS):
+                s["buckets"][i] += 1
+        s["sum"] += value
+        s["count"] += 1
+
+
+def inc(name, n=1, **labels):
+    """Add n to a counter family."""
+    with _lock:
+        k = _key(name, labels)
+        _series[k] = _series.get(k, 0) + n
+
+
+@contextlib.contextmanager
+def timer(name, **labels):
+    """Observe the block's wall time in seconds."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - t0, **labels)
+
+
+def cache(layer, hit):
+    inc("cache_requests_total", layer=layer, result="hit" if hit else "miss")
+
+
+# =================================================
+# GAUGES — sampled when the metrics are rendered
+# =================================================
+def resident_memory():
+    """Current RSS in bytes (Linux /proc), else the peak RSS from getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def session_opened():
+    global _sessions
+    with _lock:
+        _sessions += 1
+
+
+def session_closed():
+    global _sessions
+    with _lock:
+        _sessions -= 1
+
+
+def active_sessions():
+    """Connected sessions, as counted by app.py's session-scoped tracker."""
+    return _sessions
+
+
+def ready():
+    return all(check() for check in READY_CHECKS)
+
+
+# =================================================
+# PROMETHEUS TEXT FORMAT
+# =================================================
+def _labels(labels, **extra):
+    items = list(labels) + sorted(extra.items())
+    if not items:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in items) + "}"
+
+
+def _copy(v):
+    if not isinstance(v, dict):
+        return v
+    return {"window": sorted(v.get("window", ())), "buckets": list(v.get("buckets", ())),
+            "sum": v["sum"], "count": v["count"]}
+
+
+def _quantile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def render():
+    """All metrics in Prometheus text exposition format (version 0.0.4)."""
+    with _lock:
+        snapshot = {k: _copy(v) for k, v in _series.items()}
+    gauges = {
+        "active_sessions": active_sessions(),
+        "resident_memory_bytes": resident_memory(),
+        "ready": int(ready()),
+    }
+
+    lines = []
+    for name, (kind, help_text) in FAMILIES.items():
+        full = f"{PREFIX}_{name}"
+        lines += [f"# HELP {full} {help_text}", f"# TYPE {full} {kind}"]
+        if kind == "gauge":
+            if gauges.get(name) is not None:
+                lines.append(f"{full} {gauges[name]}")
+            continue
+        for (n, labels), v in sorted(snapshot.items()):
+            if n != name:
+                continue
+            if kind == "counter":
+                lines.append(f"{full}{_labels(labels)} {v}")
+                continue
+            if kind == "summary":
+                for q in QUANTILES:
+                    if v["window"]:
+                        lines.append(f"{full}{_labels(labels, quantile=q)} {_quantile(v['window'], q):.6f}")
+            else:
+                cum = 0
+                for le, c in zip(BUCKETS, v["buckets"]):
+                    cum += c
+                    lines.append(f"{full}_bucket{_labels(labels, le=le)} {cum}")
+                lines.append(f"{full}_bucket{_labels(labels, le='+Inf')} {v['count']}")
+            lines.append(f"{full}_sum{_labels(labels)} {v['sum']:.6f}")
+            lines.append(f"{full}_count{_labels(labels)} {v['count']}")
+    return "\n".join(lines) + "\n"
+
+
+# =================================================
+# EXPOSITION — HTTP endpoint and/or periodic file
+# =================================================
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/ready":  # load-balancer health check
+            ok = ready()
+            body = b"ready\n" if ok else b"warming up\n"
+            self.send_response(200 if ok else 503)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if path not in ("/", "/metrics"):
+            self.send_error(404, "Not found")
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, host="127.0.0.1"):
+    """Start the /metrics and /ready endpoints on a daemon thread and return the server."""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def write_file(path):
+    """Atomically replace path with the current metrics (node_exporter textfile style)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def write_periodically(path, interval):
+    """Rewrite path every interval seconds on a daemon thread."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                write_file(path)
+            except OSError:
+                pass
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    return thread
+
+
+_started = False
+
+
+def start_from_env():
+    """Start whichever exporters METRICS_PORT / METRICS_FILE ask for (once per process)."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    if os.environ.get("METRICS_PORT"):
+        serve(int(os.environ["METRICS_PORT"]), os.environ.get("METRICS_HOST", "127.0.0.1"))
+    if os.environ.get("METRICS_FILE"):
+        write_periodically(os.environ["METRICS_FILE"], float(os.environ.get("METRICS_INTERVAL", 15)))
+
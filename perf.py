@@ -0,0 +1,105 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+import streamlit as st
+
+# =================================================
+# STAGE TIMING — named timers + counters per rerun
+# =================================================
+# Recording is on for a session when the URL has ?perf=1 (adds the debug
+# panel) or for every session when PERF_LOG names a JSON-lines file. When
+# neither is set, stage() and count() are a thread-local lookup and return.
+LOG_PATH = os.environ.get("PERF_LOG")
+QUERY_PARAM = "perf"
+
+_local = threading.local()  # Streamlit runs each session's script on its own thread
+_log_lock = threading.Lock()
+_NULL = contextlib.nullcontext()
+
+
+class Run:
+    """Timings and counters collected during one (full or fragment) rerun of a view."""
+
+    def __init__(self, view):
+        self.view = view
+        self.started = time.time()
+        self.timers = {}    # name -> [seconds, calls]
+        self.counters = {}  # name -> total
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            t = self.timers.setdefault(name, [0.0, 0])
+            t[0] += time.perf_counter() - t0
+            t[1] += 1
+
+    def to_dict(self, total):
+        return {
+            "ts": round(self.started, 3),
+            "view": self.view,
+            "total_ms": round(total * 1000, 2),
+            "stages": {k: {"ms": round(s * 1000, 2), "calls": n} for k, (s, n) in self.timers.items()},
+            "counters": self.counters,
+        }
+
+
+def enabled():
+    """True while a run is being recorded on this thread."""
+    return getattr(_local, "run", None) is not None
+
+
+def stage(name):
+    """Context manager timing the named stage; a shared no-op when recording is off."""
+    r = getattr(_local, "run", None)
+    return _NULL if r is None else r.stage(name)
+
+
+def count(name, n=1):
+    """Add n to the named counter (rows processed, bytes sent, cache hits...)."""
+    r = getattr(_local, "run", None)
+    if r is not None:
+        r.counters[name] = r.counters.get(name, 0) + n
+
+
+@contextlib.contextmanager
+def run(view):
+    """Record everything the block does; afterwards log it and show the panel if requested."""
+    show_panel = st.query_params.get(QUERY_PARAM) == "1"
+    if not (show_panel or LOG_PATH):
+        yield
+        return
+
+    _local.run = r = Run(view)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.run = None
+    record = r.to_dict(time.perf_counter() - t0)
+
+    if LOG_PATH:
+        with _log_lock, open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    if show_panel:
+        panel(record)
+
+
+def panel(record):
+    """Collapsible table of the rerun's stage timings and counters."""
+    with st.expander(f"Performance — {record['total_ms']:.0f} ms", expanded=False):
+        rows = sorted(record["stages"].items(), key=lambda kv: kv[1]["ms"], reverse=True)
+        st.dataframe(
+            [{"stage": k, "ms": v["ms"], "calls": v["calls"]} for k, v in rows],
+            hide_index=True, use_container_width=True,
+        )
+        if record["counters"]:
+            st.dataframe(
+                [{"counter": k, "value": v} for k, v in sorted(record["counters"].items())],
+                hide_index=True, use_container_width=True,
+            )
@@ -0,0 +1,174 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+import metrics
+import snapshot
+import views
+
+# =================================================
+# PREFETCH — draw the views a user is likely to open next
+# =================================================
+# Every view switch is counted as a transition, process-wide: users share the
+# same routine (Breadth → RBI → OI → PE/PB), and the nav order stands in as a
+# prior until there is history. After a switch, the likeliest next views are
+# rendered on a small thread pool outside any session — widgets return their
+# defaults, which is what a view opens with, and st.* output goes nowhere —
+# so their figures land in charts' shared figure cache, which also does the
+# evicting. Switching to one of them is then mostly cache hits.
+#
+# Data comes from the published snapshot (live or SNAPSHOT_DIR) only, never
+# straight from the Sheets API. A session's queued prefetches are cancelled
+# when it switches again (running ones stop at the next figure), and nothing
+# new is queued while prefetching has used more than CPU_BUDGET of one core
+# over the last BUDGET_WINDOW seconds.
+WORKERS = int(os.environ.get("PREFETCH_WORKERS", 2))
+TOP = int(os.environ.get("PREFETCH_TOP", 2))  # next views considered per switch
+MIN_PROBABILITY = float(os.environ.get("PREFETCH_MIN_PROBABILITY", 0.2))
+CPU_BUDGET = float(os.environ.get("PREFETCH_CPU_BUDGET", 0.25))  # fraction of one core; 0 turns prefetch off
+BUDGET_WINDOW = 60.0  # seconds
+PRIOR = 1  # pseudo-count for the view after the current one in nav order
+
+
+class Cancelled(Exception):
+    """Raised inside a prefetch once every session that wanted it has moved on."""
+
+
+class Job:
+    """One view being prefetched for one snapshot version, on behalf of some sessions."""
+
+    def __init__(self, view, version):
+        self.view = view
+        self.version = version
+        self.sessions = set()
+        self.cancelled = threading.Event()
+        self.future = None
+
+
+_lock = threading.Lock()
+_transitions = Counter()  # (from view, to view) -> switches
+_jobs = {}                # view -> Job queued or running
+_done = set()             # (view, version) already prefetched
+_cpu = deque()            # (finished at, CPU seconds) per prefetch
+_local = threading.local()
+_pool = None
+
+
+class _BareMode(logging.Filter):
+    """Prefetch threads run views without a session on purpose; drop Streamlit's warning about it."""
+
+    def filter(self, record):
+        return not record.threadName.startswith("prefetch")
+
+
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(_BareMode())
+
+
+def predict(view):
+    """[(next view, probability)] for the TOP likeliest switches away from view."""
+    names = list(views.VIEWS)
+    with _lock:
+        counts = Counter({to: n for (frm, to), n in _transitions.items() if frm == view})
+    i = names.index(view)
+    if i + 1 < len(names):
+        counts[names[i + 1]] += PRIOR
+    total = sum(counts.values())
+    return [(to, n / total) for to, n in counts.most_common(TOP) if n / total >= MIN_PROBABILITY]
+
+
+def checkpoint():
+    """Raise Cancelled if this thread's prefetch is no longer wanted; a no-op elsewhere."""
+    job = getattr(_local, "job", None)
+    if job is not None and job.cancelled.is_set():
+        raise Cancelled(job.view)
+
+
+def _cpu_used():
+    """CPU seconds spent prefetching within the last BUDGET_WINDOW. Call with _lock held."""
+    while _cpu and _cpu[0][0] < time.monotonic() - BUDGET_WINDOW:
+        _cpu.popleft()
+    return sum(seconds for _, seconds in _cpu)
+
+
+def _run(job):
+    _local.job = job
+    t0 = time.thread_time()
+    outcome = "done"
+    try:
+        checkpoint()
+        snap = snapshot.current()
+        if snap is None or snap.version != job.version:
+            raise Cancelled(job.view)
+        views.load(job.view).render({k: snap.sheet(k) for k in views.VIEWS[job.view].sheets})
+        with _lock:
+            _done.add((job.view, job.version))
+    except Cancelled:
+        outcome = "cancelled"
+    except Exception:
+        outcome = "failed"
+    finally:
+        _local.job = None
+        with _lock:
+            _cpu.append((time.monotonic(), time.thread_time() - t0))
+            if _jobs.get(job.view) is job:
+                del _jobs[job.view]
+        metrics.inc("prefetch_total", view=job.view, outcome=outcome)
+
+
+def _schedule(view, version, session):
+    """Queue a prefetch of view unless it's done, already queued, or over budget. Call with _lock held."""
+    global _pool
+    if (view, version) in _done or not views.VIEWS[view].sheets:  # image galleries: nothing to draw
+        return None
+    if not getattr(views.load(view), "PREFETCH", True):
+        return None
+    job = _jobs.get(view)
+    if job is not None and job.version == version and not job.cancelled.is_set():
+        job.sessions.add(session)
+        return None
+    if _cpu_used() > CPU_BUDGET * BUDGET_WINDOW:
+        return "over_budget"
+    if _pool is None:
+        _pool = ThreadPoolExecutor(WORKERS, thread_name_prefix="prefetch")
+    job = _jobs[view] = Job(view, version)
+    job.sessions.add(session)
+    job.future = _pool.submit(_run, job)
+    return "queued"
+
+
+def visit(view):
+    """Record a switch to view and prefetch the views this session is likely to open next."""
+    prev = st.session_state.get("_view")
+    if prev == view:  # a rerun within the view
+        return
+    st.session_state["_view"] = view
+    session = st.session_state.setdefault("_prefetch_session", object())
+    snap = snapshot.current()
+
+    outcomes = []
+    with _lock:
+        if prev is not None:
+            _transitions[prev, view] += 1
+        for name, job in list(_jobs.items()):  # this session has moved on
+            job.sessions.discard(session)
+            if not job.sessions:
+                job.cancelled.set()
+                if job.future.cancel():
+                    del _jobs[name]
+                    outcomes.append((name, "cancelled"))
+
+    if snap is not None and CPU_BUDGET > 0:
+        likely = predict(view)
+        with _lock:
+            _done.difference_update({d for d in _done if d[1] != snap.version})
+            for name, _ in likely:
+                outcome = _schedule(name, snap.version, session)
+                if outcome:
+                    outcomes.append((name, outcome))
+    for name, outcome in outcomes:
+        metrics.inc("prefetch_total", view=name, outcome=outcome)
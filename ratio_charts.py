@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+
+import chart_archive
+import image_pipeline
+
+# =================================================
+# PRICE STORE — one file per instrument: <SYMBOL>.csv or <SYMBOL>.parquet
+# with a date column and a close column (daily bars)
+# =================================================
+PRICE_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "price_store")
+STORE_EXTENSIONS = (".csv", ".parquet")
+
+DATE_COLUMNS  = ("Date", "date", "DATE", "time", "Time")
+CLOSE_COLUMNS = ("Close", "close", "CLOSE", "Adj Close", "Price", "price")
+
+# The screenshot galleries these charts replace; their filenames name the pairs
+RATIO_GROUPS = {
+    "Asset Class": "asset_class_charts",
+    "Metal":       "metal_charts",
+}
+
+
+def gallery_pairs(root):
+    """Sorted (numerator, denominator) pairs named by <NUM>_<DEN>_<timestamp> files under root."""
+    pairs = set()
+    for _, _, files in os.walk(root):
+        for f in files:
+            if not f.lower().endswith(image_pipeline.IMAGE_EXTENSIONS):
+                continue
+            parts = chart_archive.parse_snapshot(f)[0].split("_")
+            if len(parts) == 2:
+                pairs.add(tuple(parts))
+    return sorted(pairs)
+
+
+def store_signature(store=PRICE_STORE):
+    """(name, size, mtime) of every price file — changes whenever the store is updated."""
+    if not os.path.isdir(store):
+        return ()
+    return tuple(
+        (f, e.st_size, e.st_mtime_ns)
+        for f in sorted(os.listdir(store)) if f.lower().endswith(STORE_EXTENSIONS)
+        for e in [os.stat(os.path.join(store, f))]
+    )
+
+
+def _read_series(path):
+    df = pd.read_parquet(path) if path.lower().endswith(".parquet") else pd.read_csv(path)
+    date_col  = next((c for c in DATE_COLUMNS if c in df.columns), df.columns[0])
+    close_col = next((c for c in CLOSE_COLUMNS if c in df.columns), df.columns[-1])
+    s = pd.Series(
+        pd.to_numeric(df[close_col], errors="coerce").to_numpy(),
+        index=pd.to_datetime(df[date_col], errors="coerce"),
+    )
+    s = s[s.index.notna()].dropna()
+    return s[~s.index.duplicated(keep="last")].sort_index()
+
+
+def load_prices(store=PRICE_STORE):
+    """Wide frame of daily closes: DatetimeIndex rows, one float column per symbol."""
+    series = {
+        os.path.splitext(f)[0]: _read_series(os.path.join(store, f))
+        for f, _, _ in store_signature(store)
+    }
+    if not series:
+        return pd.DataFrame(dtype="float64")
+    return pd.concat(series, axis=1).sort_index().astype("float64")
+
+
+def compute_ratio(prices, num, den):
+    """num / den on the dates both instruments traded (one vectorized division)."""
+    both = prices[[num, den]].dropna()
+    both = both[both[den] != 0]
+    return pd.DataFrame({"Date": both.index, "Ratio": both[num].to_numpy() / both[den].to_numpy()})
+
+
+def available_pairs(prices, group):
+    """The group's gallery pairs for which both instruments are in the price store."""
+    return [(n, d) for n, d in gallery_pairs(RATIO_GROUPS[group])
+            if n in prices.columns and d in prices.columns]
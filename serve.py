@@ -0,0 +1,21 @@
+import os
+import sys
+
+from streamlit.web import cli as stcli
+
+import metrics
+import warmup
+
+# =================================================
+# SERVER ENTRY POINT — python serve.py [streamlit run options]
+# =================================================
+# Same as `streamlit run app.py`, except that the warm-up and the /metrics +
+# /ready endpoints start with the process rather than with the first session,
+# so a load balancer only routes users here once every cache is warm.
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+if __name__ == "__main__":
+    metrics.start_from_env()
+    warmup.start()
+    sys.argv = ["streamlit", "run", APP] + sys.argv[1:]
+    sys.exit(stcli.main())
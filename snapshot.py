@@ -0,0 +1,308 @@
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import pyarrow as pa
+
+# =================================================
+# DATA SNAPSHOTS — the ETL pipeline as an offline build step
+# =================================================
+# python snapshot.py runs fetch -> clean -> every view's parse step and the
+# Auto Dashboard HTML outside Streamlit, and writes a versioned directory:
+#
+#   <root>/<version>/manifest.json   version, source, files, image listings
+#   <root>/<version>/sheets/*.arrow  cleaned sheet frames (Arrow IPC files)
+#   <root>/<version>/derived/*       every value the views memoise via data.derived
+#   <root>/CURRENT                   name of the version to serve
+#
+# With SNAPSHOT_DIR=<root> the app memory-maps the CURRENT snapshot instead of
+# calling the Sheets API, so a fresh server is ready as soon as it starts.
+#
+# Several server processes can share one root — ideally on a tmpfs such as
+# /dev/shm — refreshed by a single `snapshot.py --every N` loader. Versions are
+# numbered; numeric columns are written so that they map straight into
+# pandas without a copy, so every process reads the same physical pages and
+# data memory doesn't grow with the number of workers.
+ROOT = os.environ.get("SNAPSHOT_DIR")
+POINTER = "CURRENT"
+MANIFEST = "manifest.json"
+IMAGE_ROOTS = ("asset_class_charts", "metal_charts", "multiasset_charts", "magazine_cover")
+
+
+def _table(df):
+    """Arrow table for df whose numeric columns convert back to pandas zero-copy.
+
+    from_pandas turns NaN / NaT into nulls, and a column with nulls has to be
+    copied on the way back; here NaN stays a float and NaT stays its int64
+    sentinel, so the columns have no nulls at all.
+    """
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):  # mixed text / number cells in an object column
+        df = df.astype({c: "string" for c in df.select_dtypes("object")})
+        table = pa.Table.from_pandas(df)
+    for i, field in enumerate(table.schema):
+        if field.name not in df.columns:
+            continue
+        values = df[field.name].to_numpy()
+        if values.dtype.kind == "f":
+            table = table.set_column(i, field, pa.array(values, from_pandas=False))
+        elif values.dtype.kind == "M":
+            table = table.set_column(i, field, pa.array(values.view("i8")).view(field.type))
+    return table
+
+
+def _write_frame(path, df):
+    table = _table(df)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return {"file": os.path.relpath(path, os.path.dirname(os.path.dirname(path))), "rows": len(df)}
+
+
+def _read_frame(path):
+    """Read-only DataFrame over a memory-mapped Arrow IPC file; pages are read on first touch."""
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+# =================================================
+# BUILD
+# =================================================
+def artifacts(frames):
+    """(derived key, value) for everything the views compute with data.derived."""
+    from views import auto_dashboard, breadth, india_macro, mtf, nifty_returns, rbi_liquidity
+
+    for choice, name in breadth.breadth_key_map.items():
+        yield f"breadth_{choice}", breadth.parse_dataset(frames["df_main"], breadth.mapping[name])
+    yield "rbi", rbi_liquidity.parse(frames["df_rbi"])
+    yield "india_macro", india_macro.parse(frames["df_india_macro"])
+    yield "nifty_ret", nifty_returns.parse(frames["df_nifty_ret"])
+    yield "mtf_net", mtf.parse_series(frames["df_mtf"], "DATE_1", "NET MTF OUTSTANDING", "Net MTF Outstanding")
+    for company, (date_col, val_col) in mtf.COMPANY_MTF_MAP.items():
+        if date_col in frames["df_mtf"].columns and val_col in frames["df_mtf"].columns:
+            yield f"mtf_{company}", mtf.parse_series(frames["df_mtf"], date_col, val_col, "Value")
+    yield "auto_dashboard_html", auto_dashboard.build_html(frames["df_auto_sales"].copy())
+
+
+def image_listings():
+    """{folder: {mtime, sorted image names}} for every image folder under IMAGE_ROOTS."""
+    from galleries import scan_images
+
+    listings = {}
+    for top in IMAGE_ROOTS:
+        for folder, _, _ in os.walk(top):
+            images = scan_images(folder)
+            if images:
+                listings[os.path.normpath(folder)] = {"mtime": os.stat(folder).st_mtime_ns, "images": images}
+    return listings
+
+
+def build(root, fixtures_scale=None, keep=5):
+    """Run the pipeline into a new version directory under root, publish it and return its path."""
+    import data
+
+    source = "google-sheets"
+    if fixtures_scale is not None:
+        import fixtures
+        sheet = fixtures.FakeSpreadsheet(fixtures_scale)
+        data.open_spreadsheet = lambda: sheet
+        source = f"fixtures@{fixtures_scale:g}x"
+
+    version = next_version(root)
+    tmp = os.path.join(root, f".{version}.tmp")
+    try:
+        os.makedirs(os.path.join(tmp, "sheets"))
+        os.makedirs(os.path.join(tmp, "derived"))
+        manifest = {"version": version, "source": source, "created": time.time(), "sheets": {}, "derived": {}}
+
+        t0 = time.perf_counter()
+        frames = {}
+        for key in data.SHEETS:
+            frames[key] = data.fetch(key)
+            manifest["sheets"][key] = _write_frame(os.path.join(tmp, "sheets", f"{key}.arrow"), frames[key])
+            print(f"sheet    {key:24s} {len(frames[key]):>8} rows")
+
+        for i, (key, value) in enumerate(artifacts(frames)):
+            base = os.path.join(tmp, "derived", f"{i:03d}")
+            if isinstance(value, str):
+                with open(f"{base}.txt", "w", encoding="utf-8") as f:
+                    f.write(value)
+                manifest["derived"][key] = {"kind": "text", "file": f"derived/{i:03d}.txt"}
+            elif isinstance(value, tuple):
+                parts = [_write_frame(f"{base}.{j}.arrow", df) for j, df in enumerate(value)]
+                manifest["derived"][key] = {"kind": "frames", "files": [p["file"] for p in parts]}
+            else:
+                manifest["derived"][key] = {"kind": "frame", **_write_frame(f"{base}.arrow", value)}
+            print(f"derived  {key}")
+
+        manifest["images"] = image_listings()
+        manifest["build_seconds"] = round(time.perf_counter() - t0, 3)
+        with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        path = os.path.join(root, version)
+        os.rename(tmp, path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)  # never leave a partial build behind
+        raise
+    publish(root, version)
+    prune(root, keep)
+    return path
+
+
+def next_version(root):
+    """<sequence>-<timestamp>, the sequence one past the published version's."""
+    published = read_pointer(root)
+    sequence = int(published.split("-")[0]) + 1 if published else 1
+    return f"{sequence:06d}-{datetime.now():%Y%m%dT%H%M%S}"
+
+
+def publish(root, version):
+    """Atomically point root/CURRENT at version."""
+    tmp = os.path.join(root, f".{POINTER}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+    os.replace(tmp, os.path.join(root, POINTER))
+
+
+def prune(root, keep):
+    """Delete all but the newest keep versions (never the published one), and stale partial builds."""
+    current = read_pointer(root)
+    for d in os.listdir(root):
+        if d.startswith(".") and d.endswith(".tmp") and os.path.isdir(os.path.join(root, d)):
+            shutil.rmtree(os.path.join(root, d), ignore_errors=True)
+    versions = sorted(d for d in os.listdir(root) if not d.startswith(".") and d != POINTER
+                      and os.path.isdir(os.path.join(root, d)))
+    for old in versions[:-keep] if keep else []:
+        if old != current:
+            shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+
+
+# =================================================
+# OPEN — one shared, read-only Snapshot per process
+# =================================================
+class Snapshot:
+    """A built version directory; frames are memory-mapped on first use and shared by all sessions."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.version = self.manifest["version"]
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _load(self, name, load):
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = load()
+            return self._values[name]
+
+    def sheet(self, key):
+        entry = self.manifest["sheets"][key]
+        return self._load(f"sheets/{key}", lambda: _read_frame(os.path.join(self.path, entry["file"])))
+
+    def derived(self, key):
+        """The snapshot's value for a data.derived key, or None if it wasn't built."""
+        entry = self.manifest["derived"].get(key)
+        if entry is None:
+            return None
+
+        def load():
+            if entry["kind"] == "text":
+                with open(os.path.join(self.path, entry["file"]), encoding="utf-8") as f:
+                    return f.read()
+            if entry["kind"] == "frames":
+                return tuple(_read_frame(os.path.join(self.path, p)) for p in entry["files"])
+            return _read_frame(os.path.join(self.path, entry["file"]))
+        return self._load(f"derived/{key}", load)
+
+    def images(self, folder):
+        """Sorted image names for folder as listed at build time; None if it wasn't scanned or has changed since."""
+        entry = self.manifest["images"].get(os.path.normpath(folder))
+        try:
+            if entry is None or os.stat(folder).st_mtime_ns != entry["mtime"]:
+                return None
+        except OSError:
+            return None
+        return entry["images"]
+
+
+class LiveSnapshot(Snapshot):
+    """The same interface over frames and values built in this process (by warmup) rather than read from disk."""
+
+    def __init__(self, version, sheets, derived, images):
+        self.path = None
+        self.version = version
+        self.manifest = {"sheets": sheets, "derived": derived, "images": images}
+
+    def sheet(self, key):
+        return self.manifest["sheets"][key]
+
+    def derived(self, key):
+        return self.manifest["derived"].get(key)
+
+
+_open_lock = threading.Lock()
+_opened = {}  # path -> Snapshot
+_live = None  # LiveSnapshot published in-process when SNAPSHOT_DIR isn't set
+
+
+def read_pointer(root):
+    try:
+        with open(os.path.join(root, POINTER), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish_live(snap):
+    global _live
+    _live = snap
+
+
+def current(root=None):
+    """The published Snapshot under root (default SNAPSHOT_DIR), else the live one, else None."""
+    root = root or ROOT
+    if not root:
+        return _live
+    version = read_pointer(root)
+    if version is None:
+        return None
+    path = os.path.join(root, version)
+    with _open_lock:
+        if path not in _opened:
+            _opened.clear()  # sessions still holding older frames keep them alive
+            _opened[path] = Snapshot(path)
+        return _opened[path]
+
+
+# =================================================
+# CLI — python snapshot.py --out snapshots [--fixtures 1] [--keep 5] [--every 900]
+# =================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a versioned data snapshot for the dashboard.")
+    parser.add_argument("--out", default=ROOT or "snapshots", help="snapshot root (the app's SNAPSHOT_DIR)")
+    parser.add_argument("--fixtures", type=float, metavar="SCALE",
+                        help="build from synthetic sheets at this scale instead of Google Sheets")
+    parser.add_argument("--keep", type=int, default=5, help="versions to keep; older ones are deleted")
+    parser.add_argument("--every", type=float, metavar="SECONDS",
+                        help="keep running as the loader, publishing a new version this often")
+    args = parser.parse_args()
+
+    while True:
+        t0 = time.perf_counter()
+        try:
+            path = build(args.out, args.fixtures, args.keep)
+            print(f"Published {path} in {time.perf_counter() - t0:.1f} s")
+        except Exception as e:
+            if not args.every:
+                raise
+            print(f"Build failed, still serving {read_pointer(args.out)}: {e!r}")
+        if not args.every:
+            break
+        time.sleep(max(0.0, args.every - (time.perf_counter() - t0)))
@@ -0,0 +1,65 @@
+import importlib
+from collections import namedtuple
+
+import streamlit as st
+
+import data
+import downloads
+import metrics
+import perf
+
+# =================================================
+# VIEW REGISTRY — nav label -> module + the sheets it reads
+# =================================================
+# Each view lives in views/<module>.py and exposes render(sheets). A module is
+# imported the first time its view is opened, and only the sheets it lists are
+# fetched, so a rerun does the work of the selected view and nothing else.
+View = namedtuple("View", ["module", "sheets"])
+
+VIEWS = {
+    "Breadth Data":                   View("breadth",         ["df_main"]),
+    "RBI Net Liquidity Injected":     View("rbi_liquidity",   ["df_rbi"]),
+    "Index Futures OI":               View("index_oi",        ["df_index_oi"]),
+    "Index (PE / PB / DIV YLD)":      View("index_valuation", ["df_index_val"]),
+    "Asset Class Charts":             View("asset_class",     []),
+    "Metal Charts":                   View("metal",           []),
+    "Ratio Charts":                   View("ratio",           []),
+    "Tariff Timeline":                View("tariff",          ["df_tariff"]),
+    "Global Interest Rates":          View("global_rates",    ["df_global_rates"]),
+    "India Macroeconomic Indicators": View("india_macro",     ["df_india_macro"]),
+    "Auto Dashboard":                 View("auto_dashboard",  ["df_auto_sales"]),
+    "Magazine Cover":                 View("magazine_cover",  []),
+    "Multiasset Chart (One View)":    View("multiasset",      []),
+    "Net MTF Outstanding":            View("mtf",             ["df_mtf"]),
+    "Nifty 50 Fwd & Bwd Returns":     View("nifty_returns",   ["df_nifty_ret"]),
+    "Overlay (Any Series)":           View("overlay",         [k for k in data.SHEETS if k != "df_tariff"]),
+}
+
+# Optional: SQL over every sheet, only when DuckDB is installed. Imported here,
+# with the registry, so it is never half-imported on a worker thread while
+# another one draws a chart (plotly probes sys.modules["duckdb"] when it
+# serialises a figure).
+try:
+    import duckdb  # noqa: F401
+except ImportError:
+    duckdb = None
+if duckdb is not None:
+    VIEWS["SQL Query"] = View("query", list(data.SHEETS))
+
+
+def load(name):
+    """The view's module, imported on first use (later calls hit sys.modules)."""
+    return importlib.import_module(f"views.{VIEWS[name].module}")
+
+
+@st.fragment
+def render(name):
+    """Load the view's sheets and render it, timed by perf.
+
+    A fragment: the view's own widgets rerun only this function, not the page
+    header, CSS and navigation around it. Ends with a ZIP of every series the
+    view's charts offered for download.
+    """
+    with metrics.timer("rerun_seconds", view=name), perf.run(name), downloads.collect() as series:
+        load(name).render(data.load_sheets(VIEWS[name].sheets))
+    downloads.view_button(name, series)
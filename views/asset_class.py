@@ -0,0 +1,21 @@
+import streamlit as st
+
+from galleries import show_chart_gallery
+
+
+# =================================================
+# ASSET CLASS CHARTS
+# =================================================
+def render(sheets):
+    st.markdown("#### Asset Class Charts")
+
+    freq = st.radio("Frequency", ["Daily", "Weekly", "Monthly"], horizontal=True)
+
+    base_folder_map = {
+        "Daily":   "asset_class_charts/daily",
+        "Weekly":  "asset_class_charts/weekly",
+        "Monthly": "asset_class_charts/monthly",
+    }
+
+    assets = ["DXY", "USDINR", "NIFTYGS10YR", "IN10Y", "GOLD", "SILVER", "UKOIL", "SPX", "EURINR", "AW1", "EEM"]
+    show_chart_gallery(base_folder_map[freq], assets, "asset")
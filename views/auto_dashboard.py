@@ -0,0 +1,467 @@
+import json
+import os
+
+import numpy as np
+import streamlit as st
+import streamlit.components.v1 as _components
+
+import fiscal
+import perf
+from data import derived
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "auto_dashboard_preview.html")
+
+# One "Total" series per company: date column, value column
+RAW_COLUMNS = {
+    "Tata Motors PV": ("DATE_1", "TMPV TOTAL"),
+    "Tata Motors CV": ("DATE_2", "TMCV TOTAL SALES"),
+    "Mahindra":       ("DATE_3", "M&M TOTAL PV"),
+    "Hyundai":        ("DATE_4", "HYUNDAI TOTAL SALES"),
+    "Force Motors":   ("DATE_5", "FORCE TOTAL SALES"),
+    "SML Mahindra":   ("DATE_6", "SML MAHINDRA TOTAL SALES"),
+    "Maruti":         ("DATE_7", "MARUTI TOTAL SALES"),
+    "Atul Auto":      ("DATE_8", "ATUL Total sales D+E"),
+    "Ashok Leyland":  ("DATE_9", "AL TOTAL VEHICLES D+E"),
+    "Bajaj":          ("DATE_10", "Bajaj Total Sales D+E"),
+    "Hero":           ("DATE_11", "Hero Total Sales D+E"),
+    "OLA":            ("DATE_12", "OLA Total Sales"),
+    "Eicher 2W":      ("DATE_13", "Eicher Total Sales"),
+    "Eicher CV":      ("DATE_14", "Eicher CV Total Sales D+E"),
+    "TVS":            ("DATE_15", "TVS TOTAL SALES"),
+    "TVS 3W":         ("DATE_15", "TVS 3W (TOTAL)"),
+}
+
+
+# =================================================
+# AUTO DASHBOARD
+# =================================================
+def build_html(auto):
+    """Auto Dashboard HTML template with the sheet's series and labels injected."""
+    # ── helper: parse a column into {dates: ["YYYY-MM",...], values: [...]} ──
+    def to_series(df, date_col, val_col):
+        if date_col not in df.columns or val_col not in df.columns:
+            return {"dates": [], "values": []}
+        tmp = df[[date_col, val_col]].dropna()
+        tmp = tmp.sort_values(date_col)
+        return {
+            "dates":  tmp[date_col].dt.strftime("%Y-%m").tolist(),
+            "values": tmp[val_col].astype(int).tolist(),
+        }
+
+    # ── Build RAW — one "Total" series per company used by the dashboard ──
+    RAW = {co: to_series(auto, date_col, val_col) for co, (date_col, val_col) in RAW_COLUMNS.items()}
+
+    # ── DETAIL — sub-series for drill-down modals ──
+    DETAIL = {
+        "Tata Motors PV": {
+            "Total":    to_series(auto, "DATE_1", "TMPV TOTAL"),
+            "Domestic": to_series(auto, "DATE_1", "TMPV DOMESTIC SALES"),
+            "Export":   to_series(auto, "DATE_1", "TMPV INTL SALES"),
+            "EV Sales": to_series(auto, "DATE_1", "TMPV EV SALES"),
+            "ICE Sales":to_series(auto, "DATE_1", "TMPV ICE SALES"),
+        },
+        "Tata Motors CV": {
+            "Total":              to_series(auto, "DATE_2", "TMCV TOTAL SALES"),
+            "Domestic":           to_series(auto, "DATE_2", "TMCV TOTAL DOMESTIC SALES"),
+            "Intl Business":      to_series(auto, "DATE_2", "TMCV INTL BUSINESS"),
+            "HCV Trucks":         to_series(auto, "DATE_2", "TMCV HCV TRUCKS"),
+            "ILMCV Trucks":       to_series(auto, "DATE_2", "TMCV ILMCV TRUCKS"),
+            "Passenger Carriers": to_series(auto, "DATE_2", "TMCV PASSENGER CARRIERS"),
+            "SCV/Pickup":         to_series(auto, "DATE_2", "TMCV SCV CARGO & PICKUP"),
+        },
+        "Mahindra": {
+            "Total":          to_series(auto, "DATE_3", "M&M TOTAL SALES"),
+            "Utility Vehicles": to_series(auto, "DATE_3", "M&M UTILITY VEHICLES"),
+            "Total PV":       to_series(auto, "DATE_3", "M&M TOTAL PV"),
+            "Domestic CV":    to_series(auto, "DATE_3", "M&M DOMESTIC CV"),
+            "Export":         to_series(auto, "DATE_3", "M&M TOTAL EXPORT"),
+            "LCV <2T":        to_series(auto, "DATE_3", "M&M LCV < 2T"),
+            "LCV 2-3.5T":     to_series(auto, "DATE_3", "M&M LCV 2-3.5T"),
+            "3W EV":          to_series(auto, "DATE_3", "M&M 3 W INC EV"),
+            "Tractor Domestic": to_series(auto, "DATE_3", "M&M TRACTOR DOMESTIC"),
+            "Tractor Export": to_series(auto, "DATE_3", "M&M TRACTOR EXPORT"),
+            "Tractor Total":  to_series(auto, "DATE_3", "M&M TRACTOR TOTAL"),
+        },
+        "Hyundai": {
+            "Total":    to_series(auto, "DATE_4", "HYUNDAI TOTAL SALES"),
+            "Domestic": to_series(auto, "DATE_4", "HYUNDAI DOMESTIC SALES"),
+            "Export":   to_series(auto, "DATE_4", "HYUNDAI EXPORT SALES"),
+        },
+        "Force Motors": {
+            "Total":    to_series(auto, "DATE_5", "FORCE TOTAL SALES"),
+            "Domestic": to_series(auto, "DATE_5", "FORCE DOMESTIC SALES"),
+            "Export":   to_series(auto, "DATE_5", "FORCE EXPORTSALES"),
+        },
+        "SML Mahindra": {
+            "Total": to_series(auto, "DATE_6", "SML MAHINDRA TOTAL SALES"),
+            "CV":    to_series(auto, "DATE_6", "SML MAHINDRA CV"),
+            "PV":    to_series(auto, "DATE_6", "SML MAHINDRA PV"),
+        },
+        "Maruti": {
+            "Total":  to_series(auto, "DATE_7", "MARUTI TOTAL SALES"),
+            "PV":     to_series(auto, "DATE_7", "MARUTI PV"),
+            "LCV":    to_series(auto, "DATE_7", "MARUTI LCV"),
+            "OEM":    to_series(auto, "DATE_7", "MARUTI OEM"),
+            "Export": to_series(auto, "DATE_7", "MARUTI EXPORT"),
+        },
+        "Atul Auto": {
+            "Total":    to_series(auto, "DATE_8", "ATUL Total sales D+E"),
+            "Domestic": to_series(auto, "DATE_8", "ATUL Total Domestic sales"),
+            "IC Engine":to_series(auto, "DATE_8", "ATUL Total 3w - IC Engine"),
+            "EV L3":    to_series(auto, "DATE_8", "ATUL Total EV L3"),
+            "EV L5":    to_series(auto, "DATE_8", "ATUL Total EV L5"),
+            "Export":   to_series(auto, "DATE_8", "ATUL Export 3w - IC Engine"),
+        },
+        "Ashok Leyland": {
+            "Total":          to_series(auto, "DATE_9", "AL TOTAL VEHICLES D+E"),
+            "Domestic":       to_series(auto, "DATE_9", "AL TOTAL DOMESTIC VEHICLES"),
+            "M&HCV Trucks":   to_series(auto, "DATE_9", "AL DOMESTIC M&HCV TRUCKS"),
+            "M&HCV Bus":      to_series(auto, "DATE_9", "AL DOMESTIC M&HCV BUS"),
+            "LCV":            to_series(auto, "DATE_9", "AL DOMESTIC LCV"),
+            "Export M&HCV":   to_series(auto, "DATE_9", "AL TOTAL M&HCV EXPORT"),
+        },
+        "Bajaj": {
+            "Total":          to_series(auto, "DATE_10", "Bajaj Total Sales D+E"),
+            "2W Domestic":    to_series(auto, "DATE_10", "Bajaj 2W Domestic"),
+            "2W Export":      to_series(auto, "DATE_10", "Bajaj 2W Export"),
+            "Total 2W":       to_series(auto, "DATE_10", "Bajaj Total 2W D+E"),
+            "CV Domestic":    to_series(auto, "DATE_10", "Bajaj CV Domestic"),
+            "CV Export":      to_series(auto, "DATE_10", "Bajaj CV Export"),
+            "Total CV":       to_series(auto, "DATE_10", "Bajaj Total CV D+E"),
+        },
+        "Hero": {
+            "Total":       to_series(auto, "DATE_11", "Hero Total Sales D+E"),
+            "Domestic":    to_series(auto, "DATE_11", "Hero Domestic Sales"),
+            "Export":      to_series(auto, "DATE_11", "Hero Export Sales"),
+            "Motorcycles": to_series(auto, "DATE_11", "Hero Motorcycles Total"),
+            "Scooters":    to_series(auto, "DATE_11", "Hero Scooters Total"),
+        },
+        "OLA": {
+            "Total": to_series(auto, "DATE_12", "OLA Total Sales"),
+        },
+        "Eicher 2W": {
+            "Total":   to_series(auto, "DATE_13", "Eicher Total Sales"),
+            "<350cc":  to_series(auto, "DATE_13", "Eicher Less than 350 cc"),
+            ">350cc":  to_series(auto, "DATE_13", "Eicher greater than 350 cc"),
+            "Export":  to_series(auto, "DATE_13", "Eicher Total Export"),
+        },
+        "Eicher PV": {
+            "Total":   to_series(auto, "DATE_13", "Eicher Total Sales"),
+            "<350cc":  to_series(auto, "DATE_13", "Eicher Less than 350 cc"),
+            ">350cc":  to_series(auto, "DATE_13", "Eicher greater than 350 cc"),
+            "Export":  to_series(auto, "DATE_13", "Eicher Total Export"),
+        },
+        "Eicher CV": {
+            "Total":    to_series(auto, "DATE_14", "Eicher CV Total Sales D+E"),
+            "Domestic": to_series(auto, "DATE_14", "Eicher CV Domestic sales"),
+            "Export":   to_series(auto, "DATE_14", "Eicher CV Export Sales"),
+            "Volvo":    to_series(auto, "DATE_14", "Eicher CV Volvo Sales"),
+        },
+        "TVS 3W": {
+            "Total":    to_series(auto, "DATE_15", "TVS 3W (TOTAL)"),
+            "Domestic": to_series(auto, "DATE_15", "TVS 3W DOMESTIC"),
+            "Export":   to_series(auto, "DATE_15", "TVS 3W EXPORT"),
+        },
+        "TVS": {
+            "Total":          to_series(auto, "DATE_15", "TVS TOTAL SALES"),
+            "2W Total":       to_series(auto, "DATE_15", "TVS 2W (TOTAL)"),
+            "3W Total":       to_series(auto, "DATE_15", "TVS 3W (TOTAL)"),
+            "Motorcycle":     to_series(auto, "DATE_15", "TVS MOTORCYCLE (TOTAL)"),
+            "Scooter":        to_series(auto, "DATE_15", "TVS SCOOTER (TOTAL)"),
+            "EV":             to_series(auto, "DATE_15", "TVS EV (TOTAL)"),
+            "Domestic":       to_series(auto, "DATE_15", "TVS TOTAL DOMESTIC"),
+            "Export":         to_series(auto, "DATE_15", "TVS TOTAL EXPORT"),
+            "2W Domestic":    to_series(auto, "DATE_15", "TVS 2W DOMESTIC"),
+            "3W Domestic":    to_series(auto, "DATE_15", "TVS 3W DOMESTIC"),
+            "2W Export":      to_series(auto, "DATE_15", "TVS 2W EXPORT"),
+            "3W Export":      to_series(auto, "DATE_15", "TVS 3W EXPORT"),
+        },
+    }
+
+    # ── EV_RAW ──
+    EV_RAW = {
+        "Tata EV":       to_series(auto, "DATE_1",  "TMPV EV SALES"),
+        "Mahindra 3W EV":to_series(auto, "DATE_3",  "M&M 3 W INC EV"),
+        "OLA Electric":  to_series(auto, "DATE_12", "OLA Total Sales"),
+        "Atul EV":       to_series(auto, "DATE_8",  "ATUL Total EV L3"),
+        "Tata ICE":      to_series(auto, "DATE_1",  "TMPV ICE SALES"),
+        "TVS EV":        to_series(auto, "DATE_15", "TVS EV (TOTAL)"),
+    }
+
+    # ── TR_RAW ──
+    TR_RAW = {
+        "M&M Tractor":          to_series(auto, "DATE_3", "M&M TRACTOR TOTAL"),
+        "M&M Tractor Domestic": to_series(auto, "DATE_3", "M&M TRACTOR DOMESTIC"),
+        "M&M Tractor Export":   to_series(auto, "DATE_3", "M&M TRACTOR EXPORT"),
+    }
+
+    # ── Inject data into the HTML template and render ──
+    raw_json    = json.dumps(RAW,    ensure_ascii=False)
+    detail_json = json.dumps(DETAIL, ensure_ascii=False)
+    ev_json     = json.dumps(EV_RAW, ensure_ascii=False)
+    tr_json     = json.dumps(TR_RAW, ensure_ascii=False)
+
+    # Read the HTML template
+    with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+        html_template = f.read()
+
+    # Replace the hardcoded data blocks with live data
+    import re
+    # Replace RAW = {...};
+    html_template = re.sub(
+        r'const RAW = \{.*?\};',
+        f'const RAW = {raw_json};',
+        html_template, flags=re.DOTALL, count=1
+    )
+    # Replace DETAIL = {...};
+    html_template = re.sub(
+        r'const DETAIL = \{.*?\};',
+        f'const DETAIL = {detail_json};',
+        html_template, flags=re.DOTALL, count=1
+    )
+    # Replace EV_RAW = {...};
+    html_template = re.sub(
+        r'const EV_RAW = \{.*?\};',
+        f'const EV_RAW = {ev_json};',
+        html_template, flags=re.DOTALL, count=1
+    )
+    # Replace TR_RAW = {...};
+    html_template = re.sub(
+        r'const TR_RAW = \{.*?\};',
+        f'const TR_RAW = {tr_json};',
+        html_template, flags=re.DOTALL, count=1
+    )
+
+    # Patch SEGMENTS and SEG_FILTER in JS to match our actual company names
+    js_patch = """
+const SEGMENTS = {
+  'Maruti':'PV','Hyundai':'PV','Tata Motors PV':'PV','Mahindra':'PV','Force Motors':'PV','SML Mahindra':'PV',
+  'Tata Motors CV':'CV','Ashok Leyland':'CV','Eicher CV':'CV',
+  'Bajaj':'2W','Hero':'2W','Eicher 2W':'2W','OLA':'2W','TVS':'2W',
+  'Atul Auto':'3W','TVS 3W':'3W',
+};
+const SEG_FILTER = {
+  'all': null,
+  '2W': ['Bajaj','Hero','Eicher 2W','OLA','TVS'],
+  '3W': ['Atul Auto','TVS 3W'],
+  'PV': ['Maruti','Hyundai','Tata Motors PV','Mahindra','Force Motors','SML Mahindra'],
+  'CV': ['Tata Motors CV','Ashok Leyland','Eicher CV'],
+  'EV': ['Tata EV','Mahindra 3W EV','OLA Electric','Atul EV','TVS EV'],
+  'TR': ['M\u0026M Tractor'],
+};
+"""
+    # Replace the SEGMENTS and SEG_FILTER blocks in the HTML
+    import re as _re
+    html_template = _re.sub(
+        r'const SEGMENTS = \{.*?\};',
+        js_patch.split("const SEG_FILTER")[0].strip(),
+        html_template, flags=_re.DOTALL, count=1
+    )
+    html_template = _re.sub(
+        r'const SEG_FILTER = \{.*?\};',
+        "const SEG_FILTER = " + js_patch.split("const SEG_FILTER = ")[1].strip(),
+        html_template, flags=_re.DOTALL, count=1
+    )
+
+    # Compute dynamic labels from actual data
+    from datetime import datetime
+
+    all_dates = []
+    for s in RAW.values():
+        if s["dates"]:
+            all_dates.extend(s["dates"])
+
+    if all_dates:
+        latest_month  = sorted(all_dates)[-1]   # "YYYY-MM"
+        ttm_start, latest_m = fiscal.ttm_window(latest_month)
+        month_label   = lambda m: m.astype(datetime).strftime("%b %Y")
+
+        latest_label   = month_label(latest_m)                            # e.g. Apr 2026
+        prev_label     = month_label(latest_m - np.timedelta64(1, "M"))   # e.g. Mar 2026
+        yoy_label      = month_label(latest_m - np.timedelta64(12, "M"))  # e.g. Apr 2025
+        ttm_start_label= month_label(ttm_start)                           # e.g. May 2025
+    else:
+        latest_label    = datetime.now().strftime("%b %Y")
+        prev_label      = latest_label
+        yoy_label       = latest_label
+        ttm_start_label = latest_label
+
+    # Enable legend on the market share doughnut chart
+    html_template = html_template.replace(
+        "type:'doughnut',data:{labels:cos,datasets:[{data:vals,backgroundColor:cos.map(c=>getColor(c)),borderColor:'#fff',borderWidth:2}]},options:{responsive:true,maintainAspectRatio:false,cutout:'60%',plugins:{legend:{display:false}",
+        "type:'doughnut',data:{labels:cos,datasets:[{data:vals,backgroundColor:cos.map(c=>getColor(c)),borderColor:'#fff',borderWidth:2}]},options:{responsive:true,maintainAspectRatio:false,cutout:'60%',plugins:{legend:{display:true,position:'bottom',labels:{color:'#4a5568',font:{size:10},boxWidth:10,padding:8}}"
+    )
+
+    # Add TVS EV to EV_COS and EV_COLORS (hardcoded in HTML)
+    html_template = html_template.replace(
+        "const EV_COS = ['Tata EV','Mahindra 3W EV','OLA Electric','Atul EV'];",
+        "const EV_COS = ['Tata EV','Mahindra 3W EV','OLA Electric','Atul EV','TVS EV'];"
+    )
+    html_template = html_template.replace(
+        "const EV_COLORS = {'Tata EV':'#0d9e6a','Mahindra 3W EV':'#1d6af5','OLA Electric':'#e05c2a','Atul EV':'#7c3aed'};",
+        "const EV_COLORS = {'Tata EV':'#0d9e6a','Mahindra 3W EV':'#1d6af5','OLA Electric':'#e05c2a','Atul EV':'#7c3aed','TVS EV':'#0891b2'};"
+    )
+
+    # Fix hardcoded segment counts to match our SEG_FILTER
+    # PV: Maruti, Hyundai, Tata Motors PV, Mahindra, Force Motors, SML Mahindra = 6
+    # CV: Tata Motors CV, Ashok Leyland, Eicher CV = 3
+    html_template = html_template.replace(
+        '>3 Wheeler<span class="seg-cnt">1</span>',
+        '>3 Wheeler<span class="seg-cnt">2</span>'
+    )
+    html_template = html_template.replace(
+        '>Passenger Vehicle<span class="seg-cnt">3</span>',
+        '>Passenger Vehicle<span class="seg-cnt">6</span>'
+    )
+    html_template = html_template.replace(
+        '>Commercial Vehicle<span class="seg-cnt">5</span>',
+        '>Commercial Vehicle<span class="seg-cnt">3</span>'
+    )
+    html_template = html_template.replace(
+        '>2 Wheeler<span class="seg-cnt">4</span>',
+        '>2 Wheeler<span class="seg-cnt">5</span>'
+    )
+    # Update total company count (All Segments)
+    html_template = html_template.replace(
+        '>All Segments<span class="seg-cnt">14</span>',
+        '>All Segments<span class="seg-cnt">15</span>'
+    )
+
+    # ── COMPUTE FY_RAW (April–March financial year totals) ──
+    fy_raw = {}
+    for co, series in RAW.items():
+        years, totals = fiscal.fy_totals(series["dates"], np.asarray(series["values"], dtype=np.int64))
+        fy_raw[co] = {"years": years, "values": totals.tolist()}
+
+    # ── COMPUTE SHARE_HISTORY (monthly market share % per company) ──
+    all_months_set = set()
+    for s in RAW.values():
+        all_months_set.update(s["dates"])
+    all_months_sorted = sorted(all_months_set)
+    co_month_val = {co: dict(zip(s["dates"], s["values"])) for co, s in RAW.items()}
+    share_history = {co: {"dates": [], "values": []} for co in RAW}
+    for ym in all_months_sorted:
+        month_total = sum(co_month_val[co].get(ym, 0) for co in RAW)
+        if month_total == 0:
+            continue
+        for co in RAW:
+            val = co_month_val[co].get(ym, 0)
+            if val > 0:
+                share_history[co]["dates"].append(ym)
+                share_history[co]["values"].append(round(val * 100 / month_total, 2))
+
+    # ── COMPUTE CY_TOTALS (current FY April to latest month) ──
+    latest_ym_set = sorted(all_months_set)[-1]
+    cy_totals = {}
+    for co, series in RAW.items():
+        in_fy = fiscal.fytd_mask(series["dates"], latest_ym_set)
+        cy_totals[co] = int(np.asarray(series["values"], dtype=np.int64)[in_fy].sum())
+    fy_label = fiscal.fy_labels([latest_ym_set])[0]
+    html_template = html_template.replace('<th>FY Total</th>', f'<th>{fy_label}</th>')
+
+    # ── INJECT DATA OBJECTS ──
+    fy_json = json.dumps(fy_raw, ensure_ascii=False)
+    sh_json = json.dumps(share_history, ensure_ascii=False)
+    cy_json = json.dumps(cy_totals, ensure_ascii=False)
+
+    # Inject FY_RAW — after fy_json is computed, inject before EV_RAW
+    fy_inject = f"const FY_RAW = {fy_json};\nconst SHARE_HISTORY = {sh_json};\nconst CY_TOTALS = {cy_json};\nconst CY_LABEL = '{fy_label}';"
+    html_template = html_template.replace(
+        "// EV data\nconst EV_RAW",
+        fy_inject + "\n// EV data\nconst EV_RAW"
+    )
+
+
+    # ── PATCH buildShare to support historical mode ──
+    history_patch = (
+        "function buildShare(cos){\n"
+        "  if(shareMode==='history'){\n"
+        "    const allD=[...new Set(cos.flatMap(c=>(SHARE_HISTORY[c]||{dates:[]}).dates))].sort();\n"
+        "    const sl=selPeriod>=9999?allD:allD.slice(-selPeriod);\n"
+        "    const ds=cos.map(c=>({label:c,data:sl.map(d=>{const sh=SHARE_HISTORY[c]||{dates:[],values:[]};const i=sh.dates.indexOf(d);return i>=0?sh.values[i]:null;}),borderColor:getColor(c),backgroundColor:getColor(c)+'22',borderWidth:1.5,fill:false,tension:.3,pointRadius:0}));\n"
+        "    return {type:'line',data:{labels:sl,datasets:ds}};\n"
+        "  }"
+    )
+    html_template = html_template.replace("function buildShare(cos){", history_patch)
+
+    # ── PATCH table row to add CY YTD ──
+    html_template = html_template.replace(
+        "const ttm=sum(vals.slice(-12));",
+        "const ttm=sum(vals.slice(-12));const cytd=CY_TOTALS[c]||0;"
+    )
+    html_template = html_template.replace(
+        "`<td>${fmt(ttm)}</td>",
+        "`<td>${fmt(cytd)}</td><td>${fmt(ttm)}</td>"
+    )
+
+    # Replace hardcoded month labels throughout the HTML
+    # Latest month (was "Feb 2026")
+    html_template = html_template.replace("Feb 2026", latest_label)
+    html_template = html_template.replace("february 2026", latest_label.lower())
+    html_template = html_template.replace("February 2026", latest_label)
+
+    # Previous month column header (was "Jan 2026")
+    html_template = html_template.replace("Jan 2026", prev_label)
+
+    # YoY comparison label (was "Feb 2025")
+    html_template = html_template.replace("Feb 2025", yoy_label)
+
+    # TTM range label (was "Mar 2025–Feb 2026")
+    html_template = html_template.replace(
+        "Mar 2025–Feb 2026",
+        f"{ttm_start_label}–{latest_label}"
+    )
+    html_template = html_template.replace(
+        "Mar 2025–Feb 2026",
+        f"{ttm_start_label}–{latest_label}"
+    )
+
+    # Patch the topMeta JS line
+    html_template = html_template.replace(
+        "document.getElementById('topMeta').textContent=`${segLabel} · ${selPeriod>=9999?'All Time':selPeriod+' months'} · ${count} companies · Feb 2026`",
+        f"document.getElementById('topMeta').textContent=`${{segLabel}} · ${{selPeriod>=9999?'All Time':selPeriod+' months'}} · ${{count}} companies · {latest_label}`"
+    )
+
+    # Patch the YoY chart subtitle dynamically via JS injection
+    html_template = html_template.replace(
+        '<div class="card-sub">Feb 2026 vs Feb 2025</div>',
+        f'<div class="card-sub">{latest_label} vs {yoy_label}</div>'
+    )
+    html_template = html_template.replace(
+        f'<div class="card-sub">{latest_label} vs Feb 2025</div>',
+        f'<div class="card-sub">{latest_label} vs {yoy_label}</div>'
+    )
+    html_template = html_template.replace(
+        '<div class="card-sub">12-month cumulative Mar 2025–Feb 2026</div>',
+        f'<div class="card-sub">12-month cumulative {ttm_start_label}–{latest_label}</div>'
+    )
+
+    return html_template
+
+
+def render(sheets):
+    try:
+        html_template = derived("auto_dashboard_html", lambda: build_html(sheets["df_auto_sales"].copy()))
+    except FileNotFoundError:
+        st.error(f"Dashboard template not found: {os.path.basename(TEMPLATE_PATH)}. Please upload auto_dashboard_preview.html to the app root directory.")
+        return
+
+    # Inject CSS to collapse Streamlit's own padding/header when showing the dashboard
+    st.markdown("""
+<style>
+/* Hide the dashboard header and collapse all padding when Auto Dashboard is active */
+.dashboard-header { display: none !important; }
+.block-container {
+    padding-top: 0 !important;
+    padding-left: 0 !important;
+    padding-right: 0 !important;
+    padding-bottom: 0 !important;
+    max-width: 100% !important;
+}
+section[data-testid="stVerticalBlock"] > div:first-child { display: none !important; }
+</style>
+""", unsafe_allow_html=True)
+
+    perf.count("bytes.html", len(html_template))
+    _components.html(html_template, height=900, scrolling=True)
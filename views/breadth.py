@@ -0,0 +1,91 @@
+import plotly.express as px
+import streamlit as st
+
+import downloads
+import perf
+from charts import PLOT_LAYOUT, GREEN, RED, apply_tf, cached_figure, date_filter_widget, plot_single_line
+from data import derived
+
+
+# =================================================
+# DATASET MAPPING
+# =================================================
+mapping = {
+    "52 Week Data":  {"date": "DATE 1", "high": "HIGH 1", "low": "LOW 1", "hl": "H/L 1", "hr": "H RATIO 1", "lr": "L RATIO 1"},
+    "EMA 20 Data":   {"date": "DATE 2", "high": "HIGH 2", "low": "LOW 2", "hl": "H/L 2", "hr": "H RATIO 2", "lr": "L RATIO 2"},
+    "EMA 200 Data":  {"date": "DATE 3", "high": "HIGH 3", "low": "LOW 3", "hl": "H/L 3", "hr": "H RATIO 3", "lr": "L RATIO 3"},
+}
+
+# radio label -> mapping key
+breadth_key_map = {"52 Week": "52 Week Data", "EMA 20": "EMA 20 Data", "EMA 200": "EMA 200 Data"}
+
+
+def parse_dataset(df_main, m):
+    return df_main[
+        [m["date"], m["high"], m["low"], m["hl"], m["hr"], m["lr"]]
+    ].dropna()
+
+
+def high_low_figure(plot_df):
+    fig = px.line(
+        plot_df, x="Date", y=["HIGH", "LOW"],
+        color_discrete_map={"HIGH": GREEN, "LOW": RED},
+        title="High & Low Count",
+    )
+    fig.update_traces(line=dict(width=1.8))
+    fig.update_traces(selector=dict(name="HIGH"),
+        hovertemplate="<b>%{x|%d %b %Y}</b><br>High: %{y:,.0f}<extra></extra>")
+    fig.update_traces(selector=dict(name="LOW"),
+        hovertemplate="<b>%{x|%d %b %Y}</b><br>Low: %{y:,.0f}<extra></extra>")
+    fig.update_layout(**{**PLOT_LAYOUT, "height": 520})
+    return fig
+
+
+# =================================================
+# BREADTH DATA — 52 WEEK / EMA 20 / EMA 200
+# =================================================
+def render(sheets):
+    df_main = sheets["df_main"]
+
+    st.markdown("#### Breadth Data")
+
+    # Radio instead of tabs — only renders one dataset at a time,
+    # which is the only reliable way to avoid Plotly's hidden-tab width=0 bug
+    breadth_choice = st.radio(
+        "Dataset",
+        list(breadth_key_map),
+        horizontal=True,
+        key="breadth_radio",
+        label_visibility="collapsed",
+    )
+
+    m = mapping[breadth_key_map[breadth_choice]]
+
+    data = derived(f"breadth_{breadth_choice}", lambda: parse_dataset(df_main, m))
+
+    # prefix makes every chart key unique per dataset selection
+    prefix = breadth_choice.replace(" ", "_").lower()
+
+    start_br, end_br, tf_br = date_filter_widget(data[m["date"]].dropna(), f"br_{prefix}")
+
+    filtered = data[
+        (data[m["date"]] >= start_br) &
+        (data[m["date"]] <= end_br)
+    ].copy()
+
+    filtered_r = apply_tf(filtered, m["date"], tf_br)
+
+    plot_df1 = filtered_r[[m["date"], m["high"], m["low"]]].rename(
+        columns={m["date"]: "Date", m["high"]: "HIGH", m["low"]: "LOW"}
+    )
+    with perf.stage("figure"):
+        fig1 = cached_figure(high_low_figure, plot_df1)
+    st.plotly_chart(fig1, use_container_width=True, config={"displayModeBar": False}, key=f"{prefix}_hl")
+    downloads.chart_menu(plot_df1, "High & Low Count", f"{prefix}_hl")
+
+    plot_single_line(filtered_r.rename(columns={m["date"]: "Date", m["hl"]: "HIGH/LOW RATIO"}),
+                     "Date", "HIGH/LOW RATIO", title="High / Low Ratio", key=f"{prefix}_hlr")
+    plot_single_line(filtered_r.rename(columns={m["date"]: "Date", m["hr"]: "HIGH / EMA 200"}),
+                     "Date", "HIGH / EMA 200", title="High / EMA 200", color=GREEN, key=f"{prefix}_hr")
+    plot_single_line(filtered_r.rename(columns={m["date"]: "Date", m["lr"]: "LOW / EMA 200"}),
+                     "Date", "LOW / EMA 200", title="Low / EMA 200", color=RED, key=f"{prefix}_lr")
@@ -0,0 +1,30 @@
+import streamlit as st
+
+from charts import plot_single_line
+
+
+# =================================================
+# GLOBAL INTEREST RATES
+# =================================================
+def render(sheets):
+    st.markdown("#### Global Interest Rates")
+
+    rates = sheets["df_global_rates"]
+
+    country_map = {
+        "US":    ("Date_1", "Int_1"),
+        "India": ("Date_2", "Int_2"),
+        "UK":    ("Date_3", "Int_3"),
+        "China": ("Date_4", "Int_4"),
+        "Japan": ("Date_5", "Int_5"),
+    }
+
+    country = st.radio("Country", list(country_map.keys()), horizontal=True,
+                       key="rates_radio", label_visibility="collapsed")
+    dc, ic = country_map[country]
+    if dc in rates.columns and ic in rates.columns:
+        df_ = rates[[dc, ic]].dropna().rename(columns={dc: "Date", ic: "Interest Rate"})
+        plot_single_line(df_, "Date", "Interest Rate",
+                         title=f"{country} Interest Rate", key=f"rates_{country}")
+    else:
+        st.info("No data available.")
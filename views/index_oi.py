@@ -0,0 +1,45 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import downloads
+import perf
+from charts import PLOT_LAYOUT, LINE_COLOR, RED, apply_tf, cached_figure, date_filter_widget, plot_single_line
+
+
+def client_fii_figure(client_fii):
+    fig = px.line(client_fii, x="Date", y=["Client OI", "FII OI"],
+                  color_discrete_sequence=[LINE_COLOR, RED],
+                  title="Client OI vs FII OI")
+    fig.update_traces(line=dict(width=1.8))
+    fig.update_layout(**{**PLOT_LAYOUT, "height": 520})
+    fig.update_yaxes(tickformat=",", showexponent="none")
+    return fig
+
+
+# =================================================
+# INDEX FUTURES OI
+# =================================================
+def render(sheets):
+    st.markdown("#### Index Futures OI")
+
+    oi = sheets["df_index_oi"]
+
+    all_oi_dates = pd.concat([oi[c].dropna() for c in ["Date_1","Date_2","Date_3","DATE_4"]])
+    start_dt, end_dt, tf_oi = date_filter_widget(all_oi_dates, "oi")
+
+    def oi_filter(date_col, val_col):
+        df_ = oi.loc[(oi[date_col] >= start_dt) & (oi[date_col] <= end_dt), [date_col, val_col]].rename(columns={date_col: "Date"})
+        return df_.dropna()
+
+    plot_single_line(apply_tf(oi_filter("Date_1", "Index Futures OI"), "Date", tf_oi), "Date", "Index Futures OI", title="Index Futures OI", key="oi1")
+    plot_single_line(apply_tf(oi_filter("Date_2", "Nifty Futures oi"), "Date", tf_oi), "Date", "Nifty Futures oi", title="Nifty Futures OI", key="oi2")
+    plot_single_line(apply_tf(oi_filter("Date_3", "total client oi"), "Date", tf_oi), "Date", "total client oi", title="Total Client OI", key="oi3")
+
+    client_fii = oi.loc[(oi["DATE_4"] >= start_dt) & (oi["DATE_4"] <= end_dt), ["DATE_4", "Client OI", "FII OI"]].rename(columns={"DATE_4": "Date"})
+    client_fii = apply_tf(client_fii.dropna(how="all", subset=["Client OI", "FII OI"]), "Date", tf_oi)
+
+    with perf.stage("figure"):
+        fig_cf = cached_figure(client_fii_figure, client_fii)
+    st.plotly_chart(fig_cf, use_container_width=True, config={"displayModeBar": False}, key="oi_client_fii")
+    downloads.chart_menu(client_fii, "Client OI vs FII OI", "oi_client_fii")
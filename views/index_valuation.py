@@ -0,0 +1,43 @@
+import streamlit as st
+
+from charts import apply_tf, date_filter_widget, plot_single_line
+
+
+# =================================================
+# INDEX (PE / PB / DIV YLD)
+# =================================================
+def render(sheets):
+    st.markdown("#### Index Valuation Metrics")
+
+    df = sheets["df_index_val"]
+
+    # Radio instead of tabs — renders only one index at a time, no hidden-tab width=0 bug
+    idx_choice = st.radio(
+        "Index",
+        ["Nifty 50", "Nifty Midcap 100", "Nifty Smallcap 250"],
+        horizontal=True,
+        key="idx_radio",
+        label_visibility="collapsed",
+    )
+
+    if idx_choice == "Nifty 50":
+        d = df[["Date_1", "P/E_1", "P/B_1", "Div Yield_1"]].dropna(subset=["Date_1"]).rename(
+            columns={"Date_1": "Date", "P/E_1": "P/E", "P/B_1": "P/B", "Div Yield_1": "Dividend Yield"})
+        pfx = "n50"
+        label = "Nifty 50"
+    elif idx_choice == "Nifty Midcap 100":
+        d = df[["Date_2", "P/E_2", "P/B_2", "Div Yield_2"]].dropna(subset=["Date_2"]).rename(
+            columns={"Date_2": "Date", "P/E_2": "P/E", "P/B_2": "P/B", "Div Yield_2": "Dividend Yield"})
+        pfx = "mid"
+        label = "Midcap 100"
+    else:
+        d = df[["Date_3", "P/E_3", "P/B_3", "Div Yield_3"]].dropna(subset=["Date_3"]).rename(
+            columns={"Date_3": "Date", "P/E_3": "P/E", "P/B_3": "P/B", "Div Yield_3": "Dividend Yield"})
+        pfx = "sc"
+        label = "Smallcap 250"
+
+    start_idx, end_idx, tf_idx = date_filter_widget(d["Date"].dropna(), f"idx_{pfx}")
+    d_tf = apply_tf(d, "Date", tf_idx)
+    plot_single_line(d_tf, "Date", "P/E",            title=f"{label} — P/E",            key=f"idx_{pfx}_pe",  date_range=(start_idx, end_idx))
+    plot_single_line(d_tf, "Date", "P/B",            title=f"{label} — P/B",            key=f"idx_{pfx}_pb",  date_range=(start_idx, end_idx))
+    plot_single_line(d_tf, "Date", "Dividend Yield", title=f"{label} — Dividend Yield", key=f"idx_{pfx}_div", date_range=(start_idx, end_idx))
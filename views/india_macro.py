@@ -0,0 +1,32 @@
+import pandas as pd
+import streamlit as st
+
+from charts import date_filter_widget, plot_single_line
+from data import derived
+
+
+# =================================================
+# INDIA MACROECONOMIC INDICATORS
+# =================================================
+def parse(df_india_macro):
+    def macro_prep(date_col, val_col):
+        df_ = df_india_macro[[date_col, val_col]]
+        return df_.dropna(subset=[date_col]).rename(columns={date_col: "Date", val_col: "Value"})
+
+    gdp  = macro_prep("Date_1", "GDP %")
+    infl = macro_prep("Date_2", "INFLATION %")
+    loan = macro_prep("Date_3", "LOAN Growth %")
+    return gdp, infl, loan
+
+
+def render(sheets):
+    st.markdown("#### India Macroeconomic Indicators")
+
+    gdp, infl, loan = derived("india_macro", lambda: parse(sheets["df_india_macro"]))
+
+    all_macro = pd.concat([gdp["Date"], infl["Date"], loan["Date"]]).dropna()
+    start_m, end_m, tf_m = date_filter_widget(all_macro, "macro")
+
+    plot_single_line(gdp,  "Date", "Value", title="GDP Growth %",  date_range=(start_m, end_m), key="macro_gdp")
+    plot_single_line(infl, "Date", "Value", title="Inflation %",   date_range=(start_m, end_m), key="macro_infl")
+    plot_single_line(loan, "Date", "Value", title="Loan Growth %", date_range=(start_m, end_m), key="macro_loan")
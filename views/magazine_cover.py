@@ -0,0 +1,23 @@
+import os
+
+import streamlit as st
+
+from galleries import get_sorted_images, show_html_gallery
+
+
+# =================================================
+# MAGAZINE COVER
+# =================================================
+def render(sheets):
+    st.markdown("#### Magazine Cover")
+
+    all_images = []
+    for img in get_sorted_images("magazine_cover"):
+        all_images.append(os.path.join("magazine_cover", img))
+
+    contact = st.toggle("Contact sheet", key="magazine_contact",
+                        help="Send the grid as a few composite images — faster on slow connections")
+    if not all_images:
+        st.info("No covers available.")
+    else:
+        show_html_gallery(all_images, "magazine", contact_sheet=contact)
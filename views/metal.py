@@ -0,0 +1,22 @@
+import streamlit as st
+
+from galleries import show_chart_gallery
+
+
+# =================================================
+# METAL CHARTS
+# =================================================
+def render(sheets):
+    st.markdown("#### Metal Charts")
+
+    freq = st.radio("Frequency", ["Daily", "Weekly", "Monthly"], horizontal=True, key="metal_freq")
+
+    base_folder_map = {
+        "Daily":   "metal_charts/daily",
+        "Weekly":  "metal_charts/weekly",
+        "Monthly": "metal_charts/monthly",
+    }
+
+    metals = ["Hindustan Copper", "SAIL", "NMDC", "NMDC Steel", "NALCO", "Coal India",
+              "Hindustan Zinc", "Vedanta", "DXY", "stock-dxy"]
+    show_chart_gallery(base_folder_map[freq], metals, "metal")
@@ -0,0 +1,74 @@
+import streamlit as st
+
+from charts import apply_tf, date_filter_widget, plot_single_line
+from data import derived
+
+# ── Companies MTF — date col, value col pairs ──
+COMPANY_MTF_MAP = {
+    "HINDCOPPER":   ("DATE_2",  "HINDCOPPER MTF OUTSTANDING"),
+    "SAIL":         ("DATE_3",  "SAIL MTF OUTSTANDING"),
+    "NALCO":        ("DATE_4",  "NALCO MTF OUTSTANDING"),
+    "GOLDBEES":     ("DATE_5",  "GOLDBEES MTF OUTSTANDING"),
+    "SILVERBEES":   ("DATE_6",  "SILVERBEES MTF OUTSTANDING"),
+    "BHARTIARTL":   ("DATE_7",  "BHARTIARTL MTF OUTSTANDING"),
+    "SBIN":         ("DATE_8",  "SBIN MTF OUTSTANDING"),
+    "ONGC":         ("DATE_9",  "ONGC MTF OUTSTANDING"),
+    "M&M":          ("DATE_10", "M&M MTF OUTSTANDING"),
+    "COALINDIA":    ("DATE_11", "COALINDIA MTF OUTSTANDING"),
+    "NMDC":         ("DATE_12", "NMDC MTF OUTSTANDING"),
+    "CARBORUNDUM":  ("DATE_13", "CARBORUNDUM MTF OUTSTANDING"),
+    "TMPV":         ("DATE_14", "TMPV MTF OUTSTANDING"),
+    "RELIANCE":     ("DATE_15", "RELIANCE MTF OUTSTANDING"),
+    "IDEA":         ("DATE_16", "IDEA MTF OUTSTANDING"),
+    "INDIGO":       ("DATE_17", "INDIGO MTF OUTSTANDING"),
+    "KAJARIACER":   ("DATE_18", "KAJARIACER MTF OUTSTANDING"),
+    "CERA":         ("DATE_19", "CERA MTF OUTSTANDING"),
+    "TATATECH":     ("DATE_20", "TATATECH MTF OUTSTANDING"),
+    "AIAENG":       ("DATE_21", "AIAENG MTF OUTSTANDING"),
+    "IRCTC":        ("DATE_22", "IRCTC MTF OUTSTANDING"),
+}
+
+
+# =================================================
+# NET MTF OUTSTANDING
+# =================================================
+def parse_series(df_mtf, date_col, val_col, name):
+    """One (date, value) column pair of the sheet as a clean Date / name frame."""
+    df_ = df_mtf[[date_col, val_col]]
+    return df_.dropna(subset=[date_col]).rename(columns={date_col: "Date", val_col: name})
+
+
+def render(sheets):
+    mtf = sheets["df_mtf"]
+
+    st.markdown("#### Net MTF Outstanding")
+
+    # ── Radio selector for the two views ──
+    mtf_view = st.radio("View", ["Net MTF", "Companies MTF"], horizontal=True,
+                        key="mtf_view_radio", label_visibility="collapsed")
+
+    if mtf_view == "Net MTF":
+        df_plot = derived("mtf_net", lambda: parse_series(
+            mtf, "DATE_1", "NET MTF OUTSTANDING", "Net MTF Outstanding"))
+
+        start_mtf, end_mtf, tf_mtf = date_filter_widget(df_plot["Date"].dropna(), "mtf_net")
+        plot_single_line(apply_tf(df_plot, "Date", tf_mtf), "Date", "Net MTF Outstanding",
+                         title="Net MTF Outstanding", date_range=(start_mtf, end_mtf))
+
+    else:
+        company = st.radio("Company", list(COMPANY_MTF_MAP.keys()),
+                           horizontal=True, key="mtf_company_radio",
+                           label_visibility="collapsed")
+
+        date_col, val_col = COMPANY_MTF_MAP[company]
+
+        if date_col not in mtf.columns or val_col not in mtf.columns:
+            st.warning(f"Column not found in sheet: {val_col}")
+        else:
+            df_co = derived(f"mtf_{company}", lambda: parse_series(mtf, date_col, val_col, "Value"))
+
+            start_co, end_co, tf_co = date_filter_widget(df_co["Date"].dropna(), f"mtf_{company}")
+            plot_single_line(apply_tf(df_co, "Date", tf_co), "Date", "Value",
+                             title=f"{company} — MTF Outstanding",
+                             date_range=(start_co, end_co),
+                             key=f"mtf_co_{company}")
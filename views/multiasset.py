@@ -0,0 +1,37 @@
+import os
+
+import streamlit as st
+
+import chart_archive
+from galleries import get_sorted_images, show_html_gallery, show_snapshot_history
+
+
+# =================================================
+# MULTIASSET CHART (ONE VIEW)
+# =================================================
+def render(sheets):
+    st.markdown("#### Multiasset Chart — One View")
+
+    def show_images_grid(folder):
+        images = get_sorted_images(folder)
+        shown, superseded = chart_archive.split_latest(images) if latest_only else (images, [])
+        key = folder.replace("/", "_")
+        show_html_gallery([os.path.join(folder, img) for img in shown], key, contact_sheet=contact)
+        show_snapshot_history(folder, superseded, key)
+
+    freq = st.radio("Frequency", ["Weekly", "Monthly"], horizontal=True,
+                    key="multiasset_freq")
+    latest_only = st.toggle("Latest per symbol", value=True, key="multiasset_latest")
+    contact = st.toggle("Contact sheet", key="multiasset_contact",
+                        help="Send each grid as a few composite images — faster on slow connections")
+
+    base = f"multiasset_charts/{freq.lower()}"
+
+    tab1, tab2, tab3 = st.tabs(["Main", "Broad Indices", "Sectoral Indices"])
+
+    with tab1:
+        show_images_grid(f"{base}/main")
+    with tab2:
+        show_images_grid(f"{base}/broad_indices")
+    with tab3:
+        show_images_grid(f"{base}/sectoral_indices")
@@ -0,0 +1,146 @@
+import pandas as pd
+import streamlit as st
+
+import fiscal
+from data import derived
+
+
+# =================================================
+# NIFTY 50 FWD & BWD RETURNS
+# =================================================
+def toggle_sort(i):
+    """Sort-button callback: runs before the fragment reruns, so the new order shows immediately."""
+    if st.session_state.matrix_sort_col == i:
+        st.session_state.matrix_sort_asc = not st.session_state.matrix_sort_asc
+    else:
+        st.session_state.matrix_sort_col = i
+        st.session_state.matrix_sort_asc = True
+
+
+def fmt_val(v):
+    if pd.isna(v): return ""
+    try: return f"{float(v):.2f}%"
+    except: return ""
+
+
+def cell_class(v):
+    if pd.isna(v): return ""
+    try: return "red" if float(v) < 0 else "green"
+    except: return ""
+
+
+def matrix_rows_html(ret_f):
+    """<tr> rows of the returns matrix: backward returns | date & price | forward returns."""
+    rows_html = ""
+    for _, row in ret_f.iterrows():
+        rows_html += "<tr>"
+        for col in ["Bkw 5 YR", "Bkw 3 YR", "Bkw 2 YR", "Bkw 1 YR"]:
+            v = row.get(col, float("nan"))
+            rows_html += f'<td class="{cell_class(v)}">{fmt_val(v)}</td>'
+        date_str = row["Date"].strftime("%b %Y") if pd.notna(row["Date"]) else ""
+        price_v = row.get("Price", float("nan"))
+        price_str = f"{price_v:,.0f}" if pd.notna(price_v) else ""
+        rows_html += f'<td class="center">{date_str}<br><b>{price_str}</b></td>'
+        for col in ["Fwd 1yr", "Fwd 2yr", "Fwd 3yr", "Fwd 5yr"]:
+            v = row.get(col, float("nan"))
+            rows_html += f'<td class="{cell_class(v)}">{fmt_val(v)}</td>'
+        rows_html += "</tr>"
+    return rows_html
+
+
+def parse(df_nifty_ret):
+    ret = df_nifty_ret.dropna(subset=["Date"]).copy()
+
+    # Percent-formatted cells arrive unformatted, as fractions
+    pct_cols = ["Bkw 1 YR", "Bkw 2 YR", "Bkw 3 YR", "Bkw 5 YR",
+                "Fwd 1yr", "Fwd 2yr", "Fwd 3yr", "Fwd 5yr"]
+    for col in pct_cols:
+        if col in ret.columns:
+            ret[col] = ret[col] * 100
+    ret["FY"] = fiscal.fy_labels(ret["Date"])
+    return ret.sort_values("Date").reset_index(drop=True)
+
+
+def render(sheets):
+    st.markdown("#### Nifty 50 Forward & Backward Returns")
+
+    ret = derived("nifty_ret", lambda: parse(sheets["df_nifty_ret"]))
+
+    # ── Filters ──
+    MONTHS = ["All", "Jan","Feb","Mar","Apr","May","Jun",
+              "Jul","Aug","Sep","Oct","Nov","Dec"]
+    MONTH_NUM = {m: i for i, m in enumerate(MONTHS[1:], 1)}
+
+    all_fys = fiscal.fy_options(ret["Date"])
+
+    fc1, fc2 = st.columns([1, 2])
+    with fc1:
+        month_filter = st.selectbox("Month", MONTHS, key="ret_month", label_visibility="visible")
+    with fc2:
+        fy_filter = st.multiselect("Financial Year (leave empty = all)", all_fys, default=[], key="ret_fy")
+
+    # Apply filters
+    ret_f = ret.copy()
+    if month_filter != "All":
+        ret_f = ret_f[ret_f["Date"].dt.month == MONTH_NUM[month_filter]]
+    if fy_filter:
+        ret_f = ret_f[ret_f["FY"].isin(fy_filter)]
+
+    # ── Sort state via session ──
+    SORT_COLS = {
+        0: "Bkw 5 YR", 1: "Bkw 3 YR", 2: "Bkw 2 YR", 3: "Bkw 1 YR",
+        4: "Date", 5: "Fwd 1yr", 6: "Fwd 2yr", 7: "Fwd 3yr", 8: "Fwd 5yr"
+    }
+    if "matrix_sort_col" not in st.session_state:
+        st.session_state.matrix_sort_col = 4
+        st.session_state.matrix_sort_asc = False
+
+    sort_col_name = SORT_COLS[st.session_state.matrix_sort_col]
+    ret_f = ret_f.sort_values(sort_col_name, ascending=st.session_state.matrix_sort_asc)
+
+    def sort_icon(col_idx):
+        if st.session_state.matrix_sort_col == col_idx:
+            return " ▲" if st.session_state.matrix_sort_asc else " ▼"
+        return " ⇅"
+
+    # Remove "All FY" from multiselect options — "All FY" default handles that case
+    fy_options_clean = all_fys  # no "Select All" needed
+
+    # Re-sort after any filter change
+    sort_col_name = SORT_COLS[st.session_state.matrix_sort_col]
+    ret_f = ret_f.sort_values(sort_col_name, ascending=st.session_state.matrix_sort_asc)
+
+    rows_html = matrix_rows_html(ret_f)
+
+    # Single sort button row directly above table — acts as column headers
+    col_labels = ["Bkw 5Y","Bkw 3Y","Bkw 2Y","Bkw 1Y","Date/Price","Fwd 1Y","Fwd 2Y","Fwd 3Y","Fwd 5Y"]
+    sort_btns = st.columns(9)
+    for i, (label, scol) in enumerate(zip(col_labels, sort_btns)):
+        with scol:
+            active = st.session_state.matrix_sort_col == i
+            icon = ("▲" if st.session_state.matrix_sort_asc else "▼") if active else "⇅"
+            st.button(f"{label} {icon}", key=f"sort_{i}", use_container_width=True,
+                      on_click=toggle_sort, args=(i,))
+
+    st.markdown(f"""
+    <style>
+      .matrix-wrap{{overflow-x:auto;margin-top:0;}}
+      .matrix-tbl{{border-collapse:collapse;width:100%;font-family:'DM Mono',monospace;font-size:12px;}}
+      .matrix-tbl th{{background:#f2f2f0;border:1px solid #e8e8e5;padding:7px 10px;
+                      text-align:center;font-size:11px;font-weight:600;
+                      text-transform:uppercase;letter-spacing:.05em;color:#6b6b64;
+                      white-space:nowrap;}}
+      .matrix-tbl th:hover{{background:#e8e8e5;color:#1a1a18;}}
+      .matrix-tbl td{{border:1px solid #e8e8e5;padding:5px 10px;text-align:center;}}
+      .matrix-tbl .green{{background:#d1fae5;color:#065f46;}}
+      .matrix-tbl .red{{background:#fee2e2;color:#991b1b;}}
+      .matrix-tbl .center{{background:#fff;font-weight:600;color:#1a1a18;
+                           border-left:2px solid #1a1a18;border-right:2px solid #1a1a18;
+                           min-width:90px;}}
+    </style>
+    <div class="matrix-wrap">
+    <table class="matrix-tbl">
+      <tbody>{rows_html}</tbody>
+    </table>
+    </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,144 @@
+import os
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.subplots import make_subplots
+
+import data
+import downloads
+import metrics
+import perf
+from charts import CHART_HEIGHT, PLOT_LAYOUT, apply_tf, cached_figure, date_filter_widget
+from export import CHART_COLORS, dated_series
+
+# =================================================
+# OVERLAY — any series from any tab on one chart
+# =================================================
+# The picked series are aligned on a common calendar: every date any of them
+# has, from the latest first date to the last date overall, each series taking
+# its latest value on or before that date (a sorted pd.merge_asof, so monthly
+# macro prints sit level under daily market data instead of gapping) up to its
+# own last observation — a series that stops updating ends on the chart. The
+# aligned panel is kept process-wide per (data version, selection) for the last
+# OVERLAY_CACHE_ENTRIES selections, so adding and removing series or changing
+# the normalisation and axes reuses it; the date range, timeframe and
+# normalisation are applied on top. Panels are shared: treat them as read-only.
+OVERLAY_CACHE_ENTRIES = int(os.environ.get("OVERLAY_CACHE_ENTRIES", 64))
+
+NORMALISE = ["As is", "Rebase to 100", "Z-score"]
+AXES = ["Shared axis", "Dual axes"]
+DEFAULT = ["Breadth · 52 Week · High/Low", "MTF · Net MTF Outstanding"]
+
+
+def catalog(sheets):
+    """{label: sorted Date / value frame} for every series the dashboard charts."""
+    fields = {}
+    for tab, title, field, df in dated_series(sheets):
+        fields.setdefault((tab, title), []).append((field, df))
+    out = {}
+    for (tab, title), series in fields.items():
+        for field, df in series:
+            label = f"{tab} · {title}" if len(series) == 1 else f"{tab} · {title} · {field}"
+            df = df.dropna().astype({"Date": "datetime64[ns]", "value": "float64"})
+            out[label] = df.sort_values("Date").drop_duplicates("Date", keep="last").reset_index(drop=True)
+    return out
+
+
+def align(series):
+    """Date column plus one column per (name, non-empty frame), as-of aligned on the union of their dates."""
+    start = max(df["Date"].iloc[0] for _, df in series)
+    dates = pd.concat([df["Date"] for _, df in series]).drop_duplicates().sort_values()
+    panel = dates[dates >= start].to_frame().reset_index(drop=True)
+    for name, df in series:
+        panel = pd.merge_asof(panel, df.rename(columns={"value": name}), on="Date", direction="backward")
+        panel.loc[panel["Date"] > df["Date"].iloc[-1], name] = float("nan")
+    return panel
+
+
+@st.cache_resource(max_entries=OVERLAY_CACHE_ENTRIES, show_spinner=False)
+def _panel(version, selection, _catalog, _built):
+    _built.append(selection)
+    return align([(name, _catalog[name]) for name in selection])
+
+
+def panel(version, selection, catalog):
+    """The aligned panel for the selection, in selection order; joined once per set of series."""
+    built = []
+    df = _panel(version, tuple(sorted(selection)), catalog, built)
+    metrics.cache("overlay", not built)
+    return df[["Date", *selection]]
+
+
+def normalise(df, how):
+    """Rebase each series to 100 at its first value, or z-score it, over the rows given.
+
+    Series whose first value isn't positive can't be rebased and are returned as NaN.
+    """
+    values = df.iloc[:, 1:]
+    if how == "Rebase to 100":
+        first = values.bfill().iloc[0]
+        values = values / first.where(first > 0) * 100
+    elif how == "Z-score":
+        values = (values - values.mean()) / values.std()
+    return pd.concat([df[["Date"]], values], axis=1)
+
+
+def overlay_figure(df, right, height=CHART_HEIGHT, y_label=None):
+    """One line per series; names in right go on a secondary y axis."""
+    fig = make_subplots(specs=[[{"secondary_y": True}]]) if right else go.Figure()
+    for i, name in enumerate(df.columns[1:]):
+        trace = go.Scatter(x=df["Date"], y=df[name], mode="lines", name=f"{name} (R)" if name in right else name,
+                           line=dict(width=1.6, color=CHART_COLORS[i % len(CHART_COLORS)]),
+                           hovertemplate="%{y:,.2f}")
+        if right:
+            fig.add_trace(trace, secondary_y=name in right)
+        else:
+            fig.add_trace(trace)
+    fig.update_layout(**PLOT_LAYOUT, height=height, yaxis_title=y_label, showlegend=True)
+    if right:
+        fig.update_layout(yaxis2=dict(**PLOT_LAYOUT["yaxis"], showgrid=False))
+    fig.update_xaxes(hoverformat="%d %b %Y")
+    return fig
+
+
+def render(sheets):
+    st.markdown("#### Overlay")
+
+    options = data.derived("overlay_catalog", lambda: catalog(sheets))
+    selection = st.multiselect("Series", list(options), default=[s for s in DEFAULT if s in options],
+                               key="overlay_series", placeholder="Pick series from any tab…",
+                               label_visibility="collapsed")
+    empty = [name for name in selection if options[name].empty]
+    if empty:
+        st.info(f"No data yet for {', '.join(empty)}; left out of the chart.")
+        selection = [name for name in selection if name not in empty]
+    if not selection:
+        st.info("Pick one or more series to overlay.")
+        return
+
+    c1, c2 = st.columns(2)
+    with c1:
+        how = st.radio("Normalise", NORMALISE, horizontal=True, key="overlay_normalise",
+                       label_visibility="collapsed")
+    with c2:
+        axes = st.radio("Axes", AXES, horizontal=True, key="overlay_axes", label_visibility="collapsed")
+    right = ()
+    if axes == "Dual axes" and len(selection) > 1:
+        right = tuple(st.multiselect("Right axis", selection, default=selection[-1:], key="overlay_right"))
+
+    with perf.stage("align"):
+        df = panel(data.data_version(), selection, options)
+    start, end, tf = date_filter_widget(df["Date"], "overlay")
+    raw = apply_tf(df[(df["Date"] >= start) & (df["Date"] <= end)], "Date", tf)
+    df = normalise(raw, how)
+
+    skipped = [name for name in selection if raw[name].notna().any() and df[name].isna().all()]
+    if skipped and how == "Rebase to 100":
+        st.caption(f"Not rebased (first value not positive): {', '.join(skipped)} — try Z-score.")
+
+    with perf.stage("figure"):
+        fig = cached_figure(overlay_figure, df, right, CHART_HEIGHT, None if how == "As is" else how)
+    perf.count("rows.plotted", len(df))
+    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False}, key="overlay_chart")
+    downloads.chart_menu(df, "Overlay", "overlay")
@@ -0,0 +1,117 @@
+import contextlib
+import os
+import time
+
+import duckdb
+import pandas as pd
+import streamlit as st
+
+import data
+import downloads
+import metrics
+import snapshot
+from export import dated_series
+
+# =================================================
+# SQL QUERY — ad-hoc SQL over every loaded series (optional: pip install duckdb)
+# =================================================
+# Each cleaned worksheet is loaded into an in-process DuckDB table named by its
+# key without the df_ prefix (main, rbi, mtf, ...). `series` holds every
+# series the dashboard charts in one long table: tab, series, field, date,
+# value. One database per data — the snapshot version, else a fingerprint of
+# the sheets — built once and shared by all sessions on it, read-only: a single
+# SELECT per query, no file or network access. Each query runs on its own
+# cursor, so sessions don't wait on each other. Results are cached by query
+# text and data and capped at QUERY_MAX_ROWS rows.
+QUERY_MAX_ROWS = int(os.environ.get("QUERY_MAX_ROWS", 10000))
+QUERY_CACHE_ENTRIES = int(os.environ.get("QUERY_CACHE_ENTRIES", 128))
+PREFETCH = False  # nothing to draw ahead of time; see prefetch
+
+EXAMPLE = """-- Net MTF outstanding vs RBI net liquidity on days the 52-week H/L ratio was below 0.5
+SELECT b.date, b.value AS hl_ratio, m.value AS net_mtf, r.value AS rbi_net_liquidity
+FROM series b
+JOIN series m ON m.date = b.date AND m.series = 'Net MTF Outstanding'
+JOIN series r ON r.date = b.date AND r.series = 'Net Liquidity Injected'
+WHERE b.tab = 'Breadth' AND b.series = '52 Week' AND b.field = 'High/Low' AND b.value < 0.5
+ORDER BY b.date DESC"""
+
+
+def series_table(sheets):
+    """Every charted series as long rows: tab, series, field, date, value."""
+    parts = [df.assign(tab=tab, series=title, field=field)
+             for tab, title, field, df in dated_series(sheets)]
+    out = pd.concat(parts, ignore_index=True).rename(columns={"Date": "date"})
+    out = out[["tab", "series", "field", "date", "value"]]
+    return out.dropna(subset=["date", "value"]).astype({"value": "float64"})
+
+
+def data_key(sheets):
+    """The snapshot version the session is on, else a fingerprint of the sheets' contents."""
+    snap = snapshot.current()
+    if snap is not None and data.data_version() == snap.version:
+        return snap.version
+    return data.derived("query_fingerprint",
+                        lambda: "-".join(downloads.fingerprint(sheets[k]) for k in sorted(sheets)))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def database(key, _sheets):
+    """Connection for one data key: worksheet and series tables, external access off, configuration locked."""
+    con = duckdb.connect()
+    tables = {name.removeprefix("df_"): df for name, df in _sheets.items()}
+    tables["series"] = series_table(_sheets)
+    for name, df in tables.items():
+        con.register("frame", df)
+        con.execute(f'CREATE TABLE "{name}" AS SELECT * FROM frame')
+        con.unregister("frame")
+    con.execute("SET enable_external_access = false")
+    con.execute("SET lock_configuration = true")
+    return con
+
+
+@contextlib.contextmanager
+def cursor(key, sheets):
+    """A cursor of the key's database, closed on exit."""
+    cur = database(key, sheets).cursor()
+    try:
+        yield cur
+    finally:
+        cur.close()
+
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES, show_spinner=False)
+def run(sql, key, _sheets):
+    """(frame of at most QUERY_MAX_ROWS rows, truncated, milliseconds) for one SELECT."""
+    statements = duckdb.extract_statements(sql)
+    if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+        raise ValueError("Only a single SELECT (or WITH … SELECT) statement can be run here.")
+    t0 = time.perf_counter()
+    with cursor(key, _sheets) as cur, metrics.timer("query_seconds"):
+        df = cur.sql(statements[0].query).limit(QUERY_MAX_ROWS + 1).df()
+    ms = (time.perf_counter() - t0) * 1000
+    return df.head(QUERY_MAX_ROWS), len(df) > QUERY_MAX_ROWS, ms
+
+
+def render(sheets):
+    st.markdown("#### SQL Query")
+    key = data_key(sheets)
+
+    with st.expander("Tables"):
+        with cursor(key, sheets) as cur:
+            tables = cur.sql("SELECT table_name, string_agg(column_name, ', ' ORDER BY ordinal_position) AS columns "
+                             "FROM information_schema.columns GROUP BY table_name ORDER BY table_name").df()
+        st.dataframe(tables, hide_index=True, use_container_width=True)
+
+    sql = st.text_area("SQL", EXAMPLE, height=200, key="query_sql", label_visibility="collapsed")
+    if not sql.strip():
+        return
+    try:
+        df, truncated, ms = run(sql.strip(), key, sheets)
+    except (duckdb.Error, ValueError) as e:
+        st.error(str(e))
+        return
+
+    st.caption(f"{len(df):,} rows · {ms:.1f} ms")
+    if truncated:
+        st.warning(f"Showing the first {QUERY_MAX_ROWS:,} rows; add a LIMIT or aggregate to see the rest.")
+    st.dataframe(df, hide_index=True, use_container_width=True)
@@ -0,0 +1,53 @@
+import streamlit as st
+
+import ratio_charts
+from charts import apply_tf, date_filter_widget, plot_single_line
+
+
+# =================================================
+# RATIO CHARTS (LOCAL PRICE STORE)
+# =================================================
+@st.cache_data(show_spinner=False)
+def load_price_store(signature):
+    """Price store as a wide frame; signature (file sizes/mtimes) is the cache key."""
+    return ratio_charts.load_prices()
+
+
+def render(sheets):
+    st.markdown("#### Ratio Charts")
+
+    prices = load_price_store(ratio_charts.store_signature())
+
+    if prices.empty:
+        st.info(f"No price series found. Add one <SYMBOL>.csv or <SYMBOL>.parquet file "
+                f"(Date, Close) per instrument to {ratio_charts.PRICE_STORE}.")
+    else:
+        group = st.radio("Group", list(ratio_charts.RATIO_GROUPS) + ["Custom"], horizontal=True,
+                         key="ratio_group", label_visibility="collapsed")
+
+        pair = None
+        if group == "Custom":
+            symbols = list(prices.columns)
+            c1, c2 = st.columns(2)
+            with c1:
+                num = st.selectbox("Numerator", symbols, key="ratio_num")
+            with c2:
+                den = st.selectbox("Denominator", [s for s in symbols if s != num], key="ratio_den")
+            if den is None:
+                st.info("A custom ratio needs a second instrument in the price store.")
+            else:
+                pair = (num, den)
+        else:
+            pairs = ratio_charts.available_pairs(prices, group)
+            if not pairs:
+                st.info("None of this group's instruments are in the price store yet.")
+            else:
+                pair = st.selectbox("Pair", pairs, format_func=lambda p: f"{p[0]} / {p[1]}",
+                                    key=f"ratio_pair_{group}", label_visibility="collapsed")
+
+        if pair is not None:
+            num, den = pair
+            ratio = ratio_charts.compute_ratio(prices, num, den)
+            start_r, end_r, tf_r = date_filter_widget(ratio["Date"], f"ratio_{num}_{den}")
+            plot_single_line(apply_tf(ratio, "Date", tf_r), "Date", "Ratio", title=f"{num} / {den}",
+                             date_range=(start_r, end_r), key="ratio_chart")
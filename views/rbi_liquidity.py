@@ -0,0 +1,25 @@
+import pandas as pd
+import streamlit as st
+
+from charts import apply_tf, date_filter_widget, plot_single_line
+from data import derived
+
+
+# =================================================
+# RBI NET LIQUIDITY INJECTED
+# =================================================
+def parse(df_rbi):
+    rbi_1 = df_rbi[["DATE-1", "NET LIQ INC TODAY"]].dropna().sort_values("DATE-1").rename(columns={"DATE-1": "Date", "NET LIQ INC TODAY": "Net Liquidity"})
+
+    rbi_2 = df_rbi[["DATE_2", "AMOUNT"]].dropna().sort_values("DATE_2").rename(columns={"DATE_2": "Date", "AMOUNT": "Amount"})
+    return rbi_1, rbi_2
+
+
+def render(sheets):
+    st.markdown("#### RBI Net Liquidity Injected")
+
+    rbi_1, rbi_2 = derived("rbi", lambda: parse(sheets["df_rbi"]))
+
+    start_rbi, end_rbi, tf_rbi = date_filter_widget(pd.concat([rbi_1["Date"], rbi_2["Date"]]).dropna(), "rbi")
+    plot_single_line(apply_tf(rbi_1, "Date", tf_rbi), x="Date", y="Net Liquidity", title="Net Liquidity Injected", date_range=(start_rbi, end_rbi), key="rbi_netliq")
+    plot_single_line(apply_tf(rbi_2, "Date", tf_rbi), x="Date", y="Amount", title="Durable Liquidity (Amount)", date_range=(start_rbi, end_rbi), key="rbi_amount")
@@ -0,0 +1,11 @@
+import streamlit as st
+
+
+# =================================================
+# TARIFF TIMELINE
+# =================================================
+def render(sheets):
+    df_tariff = sheets["df_tariff"]
+
+    st.markdown("#### Tariff Timeline")
+    st.dataframe(df_tariff)
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+
+import data
+import image_pipeline
+import metrics
+import snapshot
+import views
+
+# =================================================
+# WARM-UP — fill every cache before the first session needs it
+# =================================================
+# Without SNAPSHOT_DIR, every sheet is fetched in parallel, every derived value
+# computed, and the result published in-process as a LiveSnapshot that
+# sessions read exactly like a file snapshot; ↺ Refresh rebuilds it. With
+# SNAPSHOT_DIR, the published version's files are paged in, and again each
+# time the loader publishes a new one. start() imports every view module on
+# the calling thread, before any warm-up or prefetch thread exists — an import
+# racing a chart render on another thread can leave a half-initialised module
+# in sys.modules — and the boot warm-up builds one figure (plotly's lazy
+# imports). The /ready health check passes
+# once a warm-up has succeeded — a failed boot is retried every RETRY_INTERVAL
+# seconds — and missing image renditions are rendered after that, not before.
+WORKERS = int(os.environ.get("WARMUP_WORKERS", 4))
+WATCH_INTERVAL = float(os.environ.get("WARMUP_WATCH_INTERVAL", 5))  # seconds between CURRENT checks
+RETRY_INTERVAL = float(os.environ.get("WARMUP_RETRY_INTERVAL", 30))  # seconds between failed boot attempts
+
+_ready = threading.Event()
+_lock = threading.Lock()
+_running = None  # Future of the warm-up in progress
+_started = False
+_sequence = 0
+
+status = {"version": None, "seconds": None, "error": None, "published": None}
+
+
+def ready():
+    return _ready.is_set()
+
+
+metrics.READY_CHECKS.append(ready)
+
+
+def _boot_caches():
+    from charts import line_figure
+    line_figure(pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=3), "v": [1, 2, 3]}), "Date", "v")
+
+
+def _build_live(pool):
+    global _sequence
+    frames = dict(zip(data.SHEETS, pool.map(data.fetch, data.SHEETS)))
+    derived = dict(snapshot.artifacts(frames))
+    _sequence += 1
+    snap = snapshot.LiveSnapshot(f"live-{_sequence:06d}-{time.time_ns()}", frames, derived,
+                                 snapshot.image_listings())
+    snapshot.publish_live(snap)
+    return snap.version
+
+
+def _page_in(pool):
+    snap = snapshot.current()
+    if snap is None:
+        return None
+    list(pool.map(snap.sheet, snap.manifest["sheets"]))
+    list(pool.map(snap.derived, snap.manifest["derived"]))
+    return snap.version
+
+
+def _render_images():
+    paths = list(image_pipeline.iter_source_images())
+    if paths:
+        image_pipeline.ensure_derivatives(paths, workers=WORKERS)
+
+
+def warm(boot=False):
+    """Run one warm-up now, or wait for the one already running. Returns a copy of status."""
+    global _running
+    with _lock:
+        future = _running
+        leader = future is None
+        if leader:
+            future = _running = Future()
+    if not leader:
+        future.result()
+        return dict(status)
+
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(WORKERS) as pool:
+            status["version"] = _page_in(pool) if snapshot.ROOT else _build_live(pool)
+            if boot:
+                _boot_caches()
+        status["error"] = None
+        status["published"] = time.time()
+        _ready.set()
+    except Exception as e:
+        status["error"] = repr(e)
+        traceback.print_exc()
+    finally:
+        status["seconds"] = round(time.perf_counter() - t0, 3)
+        with _lock:
+            _running = None
+        future.set_result(None)
+    return dict(status)
+
+
+def _run():
+    while warm(boot=True)["error"] is not None:
+        time.sleep(RETRY_INTERVAL)
+    try:
+        _render_images()
+    except Exception:
+        traceback.print_exc()
+    while snapshot.ROOT:
+        time.sleep(WATCH_INTERVAL)
+        if snapshot.read_pointer(snapshot.ROOT) != status["version"]:
+            warm()
+
+
+def start():
+    """Import every view, then warm up on a background thread, once per process.
+
+    With SNAPSHOT_DIR the thread keeps watching for new versions.
+    """
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    for name in views.VIEWS:
+        views.load(name)
+    threading.Thread(target=_run, name="warmup", daemon=True).start()